@@ -1,8 +1,6 @@
-import os
+import sys
 import time
-import pyperclip
 import signal
-import copy
 import re
 from prompt_toolkit import PromptSession, prompt
 from prompt_toolkit.key_binding import KeyBindings
@@ -14,9 +12,8 @@ from modules.CustomFileHistory import CustomFileHistory
 from modules.MessageHistory import MessageHistory
 from modules.OpenAIChatCompletionApi import OpenAIChatCompletionApi
 from modules.ModelDiscoveryService import ModelDiscoveryService
-from modules.CommandHandler import CommandHandler
+from modules.CommandHandler import CommandHandler, clear_screen
 from modules.KeyBindingsHandler import KeyBindingsHandler
-from modules.MarkdownExporter import MarkdownExporter
 from modules.Config import Config
 from modules.Version import VERSION
 from modules.ModelCommandCompleter import ModelCommandCompleter
@@ -24,6 +21,22 @@ from modules.DelegatingCompleter import DelegatingCompleter
 from string_space_completer import StringSpaceCompleter
 from prompt_toolkit.completion import merge_completers
 
+# Bright white prompt prefixes and reset for user messages in print_history
+USER_PREFIX_FIRST = "\033[1;37m> "
+USER_PREFIX_CONTINUED = "\033[1;37m*> "
+USER_SUFFIX = "\033[0m\n"
+
+# pyperclip is only needed by the clipboard commands, so it is imported on first use
+pyperclip = None
+
+def load_pyperclip():
+    """Import pyperclip on first use and return the module."""
+    global pyperclip
+    if pyperclip is None:
+        import pyperclip as pyperclip_module
+        pyperclip = pyperclip_module
+    return pyperclip
+
 
 class SigTermException(Exception):
     pass
@@ -49,11 +62,14 @@ class ChatInterface:
         model = self.config.get('model')
         system_prompt = self.config.get('system_prompt')
 
-        # Use ModelDiscoveryService to parse model string and validate
-        model_discovery = ModelDiscoveryService()
-        provider, model_name = model_discovery.parse_model_string(model)
+        # Use ModelDiscoveryService to parse model string and validate.
+        # Keep the instance around for later /mod and /dm model switches.
+        self.model_discovery = ModelDiscoveryService()
+        provider, model_name = self.model_discovery.parse_model_string(model)
 
         self.api = OpenAIChatCompletionApi.create_api_instance(providers, provider, model_name)
+        self.prompt_style = Style.from_dict({'': 'white'})
+        self.update_prompt_messages()
         chat_history_file = config.get('data_directory') + "/chat_history.txt"
         self.chat_history = CustomFileHistory(chat_history_file, max_history=100, skip_prefixes=[])
         self.spell_check_completer = StringSpaceCompleter(host='127.0.0.1', port=7878)
@@ -95,13 +111,10 @@ class ChatInterface:
             while True:
                 try:
                     self.spell_check_completer.stop() # Shouldn't be necessary, but it is
-                    # Use model name directly for prompt
-                    model_name = self.api.model_short_name()
-
-                    prompt_symbol = f'{model_name} *>' if self.history.session_active() else f'{model_name} >'
+                    prompt_message = self.active_prompt_message if self.history.session_active() else self.idle_prompt_message
                     user_input = self.session.prompt(
-                        HTML(f'<style fg="white">{prompt_symbol}</style> '),
-                        style=Style.from_dict({'': 'white'}),
+                        prompt_message,
+                        style=self.prompt_style,
                         multiline=True
                     )
                     if user_input is None or user_input.strip() == '':
@@ -126,13 +139,15 @@ class ChatInterface:
                                 self.print_history()
                             else:
                                 response = self.api.get_chat_completion(self.history.get_history())
-                                if isinstance(response, dict) and response.get('error'):
-                                    print(f"ERROR: {response['error']['message']}")
-                                elif isinstance(response, dict):
-                                    ai_response = response['choices'][0]['message']['content']
-                                    self.spell_check_completer.add_words_from_text(ai_response)
-                                    self.print_assistant_message(ai_response)
-                                    self.history.add_message("assistant", ai_response)
+                                if isinstance(response, dict):
+                                    error = response.get('error')
+                                    if error:
+                                        print(f"ERROR: {error['message']}")
+                                    else:
+                                        ai_response = response['choices'][0]['message']['content']
+                                        self.spell_check_completer.add_words_from_text(ai_response)
+                                        self.print_assistant_message(ai_response)
+                                        self.history.add_message("assistant", ai_response)
                         except KeyboardInterrupt:
                             print("\nKeyboard interrupt.")
                             self.history.remove_last_user_message()
@@ -148,25 +163,36 @@ class ChatInterface:
             pass
         self.spell_check_completer.stop()
 
+    def update_prompt_messages(self):
+        """Build the prompt messages for the current model.  Call whenever self.api changes."""
+        # Use model name directly for prompt
+        model_name = self.api.model_short_name()
+        self.active_prompt_message = HTML(f'<style fg="white">{model_name} *></style> ')
+        self.idle_prompt_message = HTML(f'<style fg="white">{model_name} ></style> ')
+
     def print_assistant_message(self, message):
         formatter = MarkdownFormatter(message)
         formatted_response = formatter.formatted_message
         print(formatted_response)
 
     def print_history(self):
-        os.system('cls' if os.name == 'nt' else 'clear')
+        clear_screen()
+        # Collect the whole history and write it out once, rather than one print per message.
+        # This is written to stdout directly rather than through print_formatted_text, since
+        # prompt_toolkit escapes the ANSI codes already embedded in formatted assistant messages.
+        output_buffer = []
         i=0
         for msg in self.history.history:
-            prompt = "> " if i==1 else "*> "
             if msg['role'] == 'user':
-                # print_formatted_text(HTML(f'<style fg="white">{prompt}{msg['content']}</style>'))
-                bright_white = "\033[1;37m"
-                reset = "\033[0m"
-                formatted_string = f"{bright_white}{prompt}{msg['content']}{reset}"
-                print(formatted_string)
+                output_buffer.append(USER_PREFIX_FIRST if i==1 else USER_PREFIX_CONTINUED)
+                output_buffer.append(msg['content'])
+                output_buffer.append(USER_SUFFIX)
             elif msg['role'] == 'assistant':
-                self.print_assistant_message(msg['content'])
+                output_buffer.append(MarkdownFormatter(msg['content']).formatted_message)
+                output_buffer.append("\n")
             i+=1
+        sys.stdout.write(''.join(output_buffer))
+        sys.stdout.flush()
 
     def show_config(self):
         config = self.config
@@ -189,7 +215,7 @@ class ChatInterface:
             try:
                 selected_code_block = formatter.select_code_block()
                 if selected_code_block:
-                    pyperclip.copy(selected_code_block)
+                    load_pyperclip().copy(selected_code_block)
                     print(f"Selected code block copied to clipboard.")
                 else:
                     time.sleep(1)
@@ -226,7 +252,7 @@ class ChatInterface:
     def copy_last_response(self):
         message = self.history.get_last_assistant_message()
         if message:
-            pyperclip.copy(message['content'])
+            load_pyperclip().copy(message['content'])
             print("Last assistant response copied to clipboard.")
             return
         print("No assistant response found to copy.")
@@ -234,11 +260,12 @@ class ChatInterface:
     def one_shot_prompt(self, prompt):
         self.history.add_message("user", prompt)
         response = self.api.get_chat_completion(self.history.get_history())
-        style = Style.from_dict({'error': 'red'})
-        if isinstance(response, dict) and response.get('error'):
-            print_formatted_text(HTML(f"<error>API ERROR:{response['error']['message']}</error>"), style=style)
-            return response['error']['message']
-        elif isinstance(response, dict):
+        if isinstance(response, dict):
+            error = response.get('error')
+            if error:
+                style = Style.from_dict({'error': 'red'})
+                print_formatted_text(HTML(f"<error>API ERROR:{error['message']}</error>"), style=style)
+                return error['message']
             ai_response = response['choices'][0]['message']['content']
             self.print_assistant_message(ai_response)
             return ai_response
@@ -246,12 +273,12 @@ class ChatInterface:
     def set_model(self, model):
         """Set the model to be used."""
         # Parse the model string to get provider and model name
-        model_discovery = ModelDiscoveryService()
         try:
-            provider, model_name = model_discovery.parse_model_string(model)
+            provider, model_name = self.model_discovery.parse_model_string(model)
             # Create a new API instance with the new model
             providers = self.config.config.providers
             self.api = OpenAIChatCompletionApi.create_api_instance(providers, provider, model_name)
+            self.update_prompt_messages()
             print(f"Model set to {self.api.model}.")
         except ValueError as e:
             print(str(e))
@@ -259,21 +286,30 @@ class ChatInterface:
     def set_default_model(self):
         """Set the default model to be used."""
         model = self.config.get('model')
-        model_discovery = ModelDiscoveryService()
         try:
-            provider, model_name = model_discovery.parse_model_string(model)
+            provider, model_name = self.model_discovery.parse_model_string(model)
             # Create a new API instance with the default model
             providers = self.config.config.providers
             self.api = OpenAIChatCompletionApi.create_api_instance(providers, provider, model_name)
+            self.update_prompt_messages()
             print(f"Model set to {self.api.model}.")
         except ValueError as e:
             print(e)
 
     def export_markdown(self, titleize=True):
         """Export the chat history to Markdown and copy it to the clipboard."""
-        title = None
-        if titleize:
-            system_prompt = """
+        from modules.MarkdownExporter import MarkdownExporter
+        exporter = MarkdownExporter(self.config.get('model'), self.history)
+        title = self.generate_export_title() if titleize else None
+        exporter.title = title
+        exporter.file = self.generate_export_file_name(title)
+        markdown = exporter.markdown()
+        load_pyperclip().copy(markdown)
+        print(f"Markdown exported to clipboard.")
+
+    def generate_export_title(self):
+        """Ask the model for a short title summarizing the chat history."""
+        system_prompt = """
 You are an export note taking assistant.  Your current task is to process the following conversation
 and create a short title for it that captures the subject in 3 to 8 words.  The title should be
 a single line of title-case text that is no longer than 50 characters.  Your output should be just the title
@@ -282,19 +318,18 @@ and nothing else.  Here is the conversation:
 ###
 
 """
-            history = copy.deepcopy(self.history.get_history())
-            # history = self.history.get_history().copy()
-            # change the role to user fo all messages so the bot doesn't get confused
-            for msg in history:
-                msg['role'] = 'user'
-            history[0] = {"role": "system", "content": system_prompt}
-            title_response = self.api.get_chat_completion(history)
-            if isinstance(title_response, dict):
-                title = title_response['choices'][0]['message']['content']
-                title = title.strip().replace('\n', ' ').replace('\r', '')
-            else:
-                title = "Untitled"
-        file = None
+        # change the role to user fo all messages so the bot doesn't get confused
+        # (message contents are immutable strings, so a shallow rebuild is enough)
+        history = [{"role": "user", "content": msg['content']} for msg in self.history.get_history()]
+        history[0] = {"role": "system", "content": system_prompt}
+        title_response = self.api.get_chat_completion(history)
+        if isinstance(title_response, dict):
+            title = title_response['choices'][0]['message']['content']
+            return title.strip().replace('\n', ' ').replace('\r', '')
+        return "Untitled"
+
+    def generate_export_file_name(self, title):
+        """Ask the model for a short file name for an export with the given title."""
         system_prompt = """
 You are a computer file system manager.  Your task is to create a succinct file name for a document
 with the supplied title.  The file name should be continous string of alphanumeric characters that
@@ -307,20 +342,31 @@ include any file extensions.  Your output should be just the file name and nothi
         file_response = self.api.get_chat_completion(history)
         if isinstance(file_response, dict):
             file = file_response['choices'][0]['message']['content']
-            file = file.strip().replace('\n', ' ').replace('\r', '')
-        else:
-            file = "untitled"
-        exporter = MarkdownExporter(self.config.get('model'), self.history, title=title, file=file)
-        markdown = exporter.markdown()
-        pyperclip.copy(markdown)
-        print(f"Markdown exported to clipboard.")
-
+            return file.strip().replace('\n', ' ').replace('\r', '')
+        return "untitled"
 
 MOD_COMMAND_PATTERN = re.compile(r'^\s*\/mod[^\s]*\s+([^\s]*)')
 
 def is_mod_command(document) -> bool:
+    """
+    Check whether the text before the cursor is a `/mod` command with an argument position.
+
+    This is called on every keystroke by the DelegatingCompleter, so it is written as a
+    hand-rolled scanner equivalent to MOD_COMMAND_PATTERN instead of running the regex:
+    optional leading whitespace, `/mod`, any non-whitespace command suffix, then at least
+    one whitespace character.
+    """
     text = document.text_before_cursor
-    match = re.match(MOD_COMMAND_PATTERN, text)
-    if match:
-        return True
-    return False
\ No newline at end of file
+    text_length = len(text)
+    index = 0
+    # skip leading whitespace
+    while index < text_length and text[index].isspace():
+        index += 1
+    if not text.startswith('/mod', index):
+        return False
+    index += 4
+    # advance past the rest of the command token
+    while index < text_length and not text[index].isspace():
+        index += 1
+    # require at least one whitespace character after the command
+    return index < text_length
\ No newline at end of file
@@ -3,19 +3,30 @@ from pygments.lexers import get_lexer_by_name
 from pygments.formatters import TerminalFormatter
 from pygments.util import ClassNotFound
 
+# Lexers keyed by language name.  Looking up a lexer scans the Pygments plugin
+# registry and compiles its token regexes, so each one is only built once.
+_LEXER_CACHE = {}
+
+def _get_lexer(language):
+    """Return a cached lexer for the language, falling back to plain text."""
+    language = language or 'text'
+    lexer = _LEXER_CACHE.get(language)
+    if lexer is None:
+        try:
+            lexer = get_lexer_by_name(language, stripall=False)
+        except ClassNotFound:
+            lexer = _get_lexer('text')
+        _LEXER_CACHE[language] = lexer
+    return lexer
+
 class CodeHighlighter:
 
     def __init__(self, style=TerminalFormatter):
         self.style = style
+        self.formatter = TerminalFormatter(style=self.style)
 
     def highlight_code(self, code, language=None):
         """Helper method to highlight code using Pygments."""
-        lexer = get_lexer_by_name('text', stripall=False)
-        if language:
-            try:
-                lexer = get_lexer_by_name(language, stripall=False)
-            except ClassNotFound:
-                pass
-        formatter = TerminalFormatter(style=self.style)
-        highlighted_code = highlight(code, lexer, formatter)
+        lexer = _get_lexer(language)
+        highlighted_code = highlight(code, lexer, self.formatter)
         return highlighted_code
@@ -2,9 +2,53 @@ import os
 import sys
 from modules.InAppHelp import IN_APP_HELP
 
+# ANSI sequence to clear the screen and move the cursor home.  Writing it directly
+# avoids forking a `clear` subprocess on every redraw.
+CLEAR_SCREEN_SEQUENCE = "\x1b[2J\x1b[H"
+# Legacy Windows consoles may not process ANSI escapes, so fall back to `cls` there
+USE_ANSI_CLEAR = os.name != 'nt'
+
+def clear_screen():
+    """Clear the terminal screen."""
+    if USE_ANSI_CLEAR:
+        sys.stdout.write(CLEAR_SCREEN_SEQUENCE)
+        sys.stdout.flush()
+    else:
+        os.system('cls')
+
 class CommandHandler:
     def __init__(self, chat_interface):
         self.chat_interface = chat_interface
+        # Dispatch table for commands that must match exactly
+        self.exact_commands = {
+            '/help': self._help_command,
+            '/h': self._help_command,
+            '/clear_history': self._clear_history_command,
+            '/ch': self._clear_history_command,
+            '/clear': self._clear_command,
+            '/c': self._clear_command,
+            '/reset': self._reset_command,
+            '/r': self._reset_command,
+            '/save': self._save_command,
+            '/s': self._save_command,
+            '/load': self._load_command,
+            '/l': self._load_command,
+            '/print': self._print_command,
+            '/p': self._print_command,
+            '/sp': self._system_prompt_command,
+            '/cb': self._code_block_command,
+            '/md': self._markdown_command,
+            '/dm': self._default_model_command,
+            '/exit': self._exit_command,
+            '/e': self._exit_command,
+            '/q': self._exit_command,
+        }
+        # Commands matched by prefix, checked in order after the exact lookup misses
+        self.prefix_commands = (
+            ('/con', self._config_command),
+            ('/mod', self._model_command),
+            ('/list', self._list_command),
+        )
 
     def handle_list_command(self, args: list) -> str:
         """Handle /list command to list available models."""
@@ -55,43 +99,68 @@ class CommandHandler:
         args = command.strip().split(' ', 1)
         command = args[0]
         args = args[1:] if len(args) > 1 else []
-        if command == '/help' or command == '/h':
-            print(IN_APP_HELP)
-        elif command == '/clear_history' or command == '/ch':
-            self.chat_interface.chat_history.clear_history()
-            print("Chat file history cleared.")
-        elif command == '/clear' or command == '/c':
-            os.system('cls' if os.name == 'nt' else 'clear')
-        elif command == '/reset' or command == '/r':
-            self.chat_interface.clear_history()
-            print("Chat history reset.")
-        elif command == '/save' or command == '/s':
-            filename = input("Enter filename to save history: ") if args == [] else args[0]
-            self.chat_interface.history.save_history(filename)
-        elif command == '/load' or command == '/l':
-            filename = input("Enter filename to load history: ") if args == [] else args[0]
-            if self.chat_interface.history.load_history(filename):
-                self.chat_interface.print_history()
-        elif command == '/print' or command == '/p':
-            self.chat_interface.print_history()
-        elif command == '/sp':
-            self.chat_interface.edit_system_prompt()
-        elif command == '/cb':
-            self.chat_interface.handle_code_block_command()
-        elif command == '/md':
-            self.chat_interface.export_markdown()
-        elif command.startswith('/con'):
-            self.chat_interface.show_config()
-        elif command.startswith('/mod'):
-            if len(args) == 0:
-                print("Please specify a model name. Type /list to see available models.")
-                return
-            self.chat_interface.set_model(args[0])
-        elif command == '/dm':
-            self.chat_interface.set_default_model()
-        elif command.startswith('/list'):
-            print(self.handle_list_command(args))
-        elif command == '/exit' or command == '/e' or command == '/q':
-            sys.exit(0)
-        else:
+        # Exact command names are a single dict lookup; only fall back to the
+        # prefix commands (e.g. /config, /model) when that misses.
+        command_function = self.exact_commands.get(command)
+        if command_function is None:
+            for prefix, prefix_function in self.prefix_commands:
+                if command.startswith(prefix):
+                    command_function = prefix_function
+                    break
+        if command_function is None:
             print("Unknown command. Type /h for a list of commands.")
+            return
+        command_function(args)
+
+    def _help_command(self, args):
+        print(IN_APP_HELP)
+
+    def _clear_history_command(self, args):
+        self.chat_interface.chat_history.clear_history()
+        print("Chat file history cleared.")
+
+    def _clear_command(self, args):
+        clear_screen()
+
+    def _reset_command(self, args):
+        self.chat_interface.clear_history()
+        print("Chat history reset.")
+
+    def _save_command(self, args):
+        filename = input("Enter filename to save history: ") if args == [] else args[0]
+        self.chat_interface.history.save_history(filename)
+
+    def _load_command(self, args):
+        filename = input("Enter filename to load history: ") if args == [] else args[0]
+        if self.chat_interface.history.load_history(filename):
+            self.chat_interface.print_history()
+
+    def _print_command(self, args):
+        self.chat_interface.print_history()
+
+    def _system_prompt_command(self, args):
+        self.chat_interface.edit_system_prompt()
+
+    def _code_block_command(self, args):
+        self.chat_interface.handle_code_block_command()
+
+    def _markdown_command(self, args):
+        self.chat_interface.export_markdown()
+
+    def _config_command(self, args):
+        self.chat_interface.show_config()
+
+    def _model_command(self, args):
+        if len(args) == 0:
+            print("Please specify a model name. Type /list to see available models.")
+            return
+        self.chat_interface.set_model(args[0])
+
+    def _default_model_command(self, args):
+        self.chat_interface.set_default_model()
+
+    def _list_command(self, args):
+        print(self.handle_list_command(args))
+
+    def _exit_command(self, args):
+        sys.exit(0)
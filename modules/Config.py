@@ -1,22 +1,157 @@
 import os
 import sys
-import toml
-import yaml
-import copy
+import json
+import pickle
 from pydantic import ValidationError
 from modules.OpenAIChatCompletionApi import OpenAIChatCompletionApi
 from modules.Types import ConfigModel, ProviderConfig, SASSY_SYSTEM_PROMPT
 from modules.ProviderManager import ProviderManager
 
+def merge_dicts_in_place(d1, d2):
+    """Merge d2 into d1, which must be owned by the caller.  None values in d2 are skipped."""
+    # walk nested dicts with an explicit stack of (destination, source) pairs instead of recursing
+    pending_merges = [(d1, d2)]
+    while pending_merges:
+        destination, source = pending_merges.pop()
+        for key, value in source.items():
+            if value is None:
+                continue
+            if isinstance(value, dict) and isinstance(destination.get(key), dict):
+                pending_merges.append((destination[key], value))
+            else:
+                destination[key] = value
+
+def chain_merge(sources):
+    """
+    Merge a chain of dicts recursively into a new dict in one pass, with later sources
+    taking precedence.  Nested dicts and lists are copied, so the result shares no
+    containers with the sources.  None values are skipped.
+    """
+    merged = {}
+    for source in sources:
+        pending_merges = [(merged, source)]
+        while pending_merges:
+            destination, source_dict = pending_merges.pop()
+            for key, value in source_dict.items():
+                if value is None:
+                    continue
+                if isinstance(value, dict):
+                    destination_dict = destination.get(key)
+                    if not isinstance(destination_dict, dict):
+                        destination_dict = destination[key] = {}
+                    pending_merges.append((destination_dict, value))
+                elif isinstance(value, list):
+                    destination[key] = list(value)
+                else:
+                    destination[key] = value
+    return merged
+
+def lowercase_provider_names(providers):
+    """
+    Return the providers keyed by lowercase name.  Provider names are normalized when
+    the config is loaded so lookups never need to lowercase the stored keys.
+    """
+    return {provider_name.lower(): provider_data for provider_name, provider_data in providers.items()}
+
+# ConfigModel field types, checked by has_config_field_types.  Every field is annotated
+# with a plain class.
+CONFIG_FIELD_TYPES = {key: field_info.annotation for key, field_info in ConfigModel.model_fields.items()}
+
+def has_config_field_types(config_data):
+    """
+    Return True if every ConfigModel field in config_data already has its annotated type,
+    in which case validation has nothing to coerce and ConfigModel.model_construct can
+    be used instead.  Keys that aren't fields are ignored by both.
+    """
+    for key, value in config_data.items():
+        field_type = CONFIG_FIELD_TYPES.get(key)
+        if field_type is not None and not isinstance(value, field_type):
+            return False
+    return True
+
+# Comment written above each field by Config.save
+CONFIG_FIELD_DESCRIPTIONS = {key: field_info.description for key, field_info in ConfigModel.model_fields.items()}
+
+def format_toml_scalar(value):
+    """
+    Format a str or bool config value as a TOML value.  JSON string escapes are all valid
+    TOML basic string escapes; DEL is the one control character JSON leaves unescaped.
+    """
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return json.dumps(value, ensure_ascii=False).replace("\x7f", "\\u007f")
+
+# Sidecar file in the data directory holding the parsed config and provider files
+CONFIG_CACHE_FILE_NAME = "config.cache"
+
+def stat_path(path):
+    """Return os.stat(path), or None if the path doesn't exist."""
+    try:
+        return os.stat(path)
+    except OSError:
+        return None
+
+def file_signature(stat_result):
+    """Return (mtime_ns, size) from a stat result, or None for a missing file."""
+    if stat_result is None:
+        return None
+    return (stat_result.st_mtime_ns, stat_result.st_size)
+
+# (cache_key, serialized cache data) per cache file, kept for the life of the process so
+# repeated Config() instantiations don't re-read the sidecar file
+_CONFIG_CACHE_DATA = {}
+
+def read_config_cache(cache_file, cache_key):
+    """Return the cached parsed files if the cache matches cache_key, otherwise None."""
+    try:
+        loaded_cache = _CONFIG_CACHE_DATA.get(cache_file)
+        if loaded_cache is not None and loaded_cache[0] == cache_key:
+            # unpickled on every hit, so each caller gets its own copy of the parsed files
+            return pickle.loads(loaded_cache[1])["files"]
+        with open(cache_file, 'rb') as file:
+            cache_data = file.read()
+        cache = pickle.loads(cache_data)
+        if cache["key"] == cache_key:
+            _CONFIG_CACHE_DATA[cache_file] = (cache_key, cache_data)
+            return cache["files"]
+    except Exception:
+        # missing, stale format or unreadable cache; fall back to parsing
+        pass
+    return None
+
+def serialize_config_cache(cache_key, parsed_files):
+    """Pickle the parsed files for write_config_cache."""
+    return pickle.dumps({"key": cache_key, "files": parsed_files}, protocol=pickle.HIGHEST_PROTOCOL)
+
+def write_config_cache(cache_file, cache_key, cache_data):
+    """Write serialized cache data to the cache.  Failures are ignored since the cache is optional."""
+    _CONFIG_CACHE_DATA[cache_file] = (cache_key, cache_data)
+    if not os.path.isdir(os.path.dirname(cache_file)):
+        return
+    temp_file = f"{cache_file}.{os.getpid()}.tmp"
+    try:
+        # the cache holds API keys from the config files, so keep it private
+        file_descriptor = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(file_descriptor, 'wb') as file:
+            file.write(cache_data)
+        os.replace(temp_file, cache_file)
+    except Exception:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
 class Config:
     """Class to handle configuration load and storage."""
 
+    __slots__ = ('data_directory', 'config_file', 'overrides', 'config', 'echo_mode', 'new_config')
+
     def __init__(self, data_directory=None, config_file=None, overrides={}, create_config=False, update_valid_models=False):
         self.data_directory = os.path.expanduser(data_directory or "~/.llm_chat_cli")
-        config_file = config_file or os.path.join(self.data_directory, "config.toml")
         self.config_file = os.path.join(self.data_directory, "config.toml")
+        config_file = config_file or self.config_file
         self.overrides = overrides
-        self.config = self.load_config(config_file, create_config)
+        self.config, config_file_exists = self.load_config(config_file, create_config)
         self.echo_mode = False
 
         # Perform model discovery if requested
@@ -28,107 +163,188 @@ class Config:
                 print(f"Warning: Model discovery failed: {e}")
                 # Continue without model discovery - don't fail config loading
 
-        if not os.path.exists(self.data_directory):
-            if create_config:
-                os.makedirs(self.data_directory)
-            else:
-                # Prompt user to create data directory and config
-                self._prompt_create_config()
-
-        if not os.path.exists(os.path.join(self.data_directory, "config.toml")):
+        if config_file == self.config_file:
+            default_config_file_exists = config_file_exists
+        else:
+            default_config_file_exists = stat_path(self.config_file) is not None
+        # Checked after model discovery, which creates the data directory when persisting
+        if not default_config_file_exists:
             if create_config:
+                # The default config file lives in the data directory, so the directory only
+                # needs probing when the file is missing
+                if stat_path(self.data_directory) is None:
+                    os.makedirs(self.data_directory)
                 self.save()
                 print(f"Created default configuration file in {self.data_directory}")
             else:
-                # Prompt user to create config file
+                # Prompt user to create data directory and config file
                 self._prompt_create_config()
 
 
     def load_config(self, config_file, create_config=False):
-        """Load configuration from the specified file."""
-        config_data = {}
-        if os.path.exists(config_file):
-            try:
-                with open(config_file, 'r') as file:
-                    config_data = toml.load(file)
-            except Exception as e:
-                if not create_config:
-                    print(f"Error loading config file: {e}")
-                    raise e
-                config_data = {}
-        else:
-            if not create_config:
-                print(f"WARNING: no config file found at {config_file}.", file=sys.stderr)
+        """
+        Load configuration from the specified file.
+
+        Returns (ConfigModel, config_file_exists) so callers don't have to probe the
+        config file again.
+        """
+        # Probe each path once with os.stat and reuse the result instead of repeated exists() checks
+        config_file_stat = stat_path(config_file)
+        # Load provider YAML configurations, if present.
+        provider_config_path = os.path.join(self.data_directory, "openaicompat-providers.yaml")
+        config_data, yaml_providers, from_cache, cache_update = self.load_config_files(
+            config_file, provider_config_path, create_config, config_file_stat, stat_path(provider_config_path))
+        # Cached provider files were validated on the run that cached them, and the built-in
+        # provider data needs no validation, so those providers are built with model_construct
+        trusted_providers = (from_cache or not (yaml_providers or config_data.get("providers"))) and not self.overrides.get("providers")
 
         if config_data.get("sassy", False):
             config_data["system_prompt"] = SASSY_SYSTEM_PROMPT
 
-        # Merges dicts recursively, with d2 values taking precedence over d1
-        # returns a new dict, does not modify d1 or d2
-        def merge_dicts(d1, d2):
-            d1 = copy.deepcopy(d1)
-            for key, value in d2.items():
-                if value is None:
-                    continue
-                if key in d1 and isinstance(d1[key], dict) and isinstance(value, dict):
-                    d1[key] = merge_dicts(d1[key], value)
-                else:
-                    d1[key] = value
-            return d1
-
         # Save provider overrides from config file, if any
-        providers_overrides = config_data.get("providers", {})
+        providers_overrides = lowercase_provider_names(config_data.get("providers", {}))
 
-        # Start with built-in provider data
-        config_data["providers"] = copy.deepcopy(OpenAIChatCompletionApi.provider_data)
-
-        # Load provider YAML configurations, if present.  Merge with existing provider data, giving precedence to YAML file.
-        provider_config_path = os.path.join(self.data_directory, "openaicompat-providers.yaml")
-        if os.path.exists(provider_config_path):
-            try:
-                with open(provider_config_path, 'r') as file:
-                    provider_data = yaml.safe_load(file)
-                    if provider_data and 'providers' in provider_data:
-                        config_data['providers'] = merge_dicts(config_data['providers'], provider_data['providers'])
-            except Exception as e:
-                print(f"Error loading provider config: {e}")
-
-        # do final overrides with provider data from config file, if any
-        config_data["providers"] = merge_dicts(config_data["providers"], providers_overrides)
+        # Merge the provider sources in precedence order: built-in provider data, then the
+        # provider YAML file, then provider overrides from the config file.  chain_merge
+        # builds a new dict, so the shared built-in data is never modified; the environment
+        # API keys below are written into the merged copy.
+        provider_sources = [OpenAIChatCompletionApi.provider_data]
+        if yaml_providers:
+            provider_sources.append(lowercase_provider_names(yaml_providers))
+        if providers_overrides:
+            provider_sources.append(providers_overrides)
+        config_data["providers"] = chain_merge(provider_sources)
 
         # Check environment variables for API keys that are not set or are set to "not-configured"
         providers = config_data.get("providers", {})
-        for provider in providers.keys():
-            api_key = os.getenv(f"{provider.upper()}_API_KEY")
+        # Build each provider's variable name once, then do a single environment lookup per provider
+        api_key_variable_names = {f"{provider.upper()}_API_KEY": provider for provider in providers}
+        environment = os.environ
+        for variable_name, provider in api_key_variable_names.items():
+            api_key = environment.get(variable_name)
             if api_key:
-                providers[provider] = {} if not providers.get(provider) else providers[provider]
+                provider_data = providers.get(provider) or {}
+                providers[provider] = provider_data
                 # override the current API key with the environment variable if it's not already set or ends with "not-configured"
-                if not providers[provider].get("api_key") or providers[provider]["api_key"].endswith("not-configured"):
-                    print(f"Using API key from environment variable {provider.upper()}_API_KEY for provider {provider}", file=sys.stderr)
-                    providers[provider]["api_key"] = api_key
+                current_api_key = provider_data.get("api_key")
+                if not current_api_key or current_api_key.endswith("not-configured"):
+                    print(f"Using API key from environment variable {variable_name} for provider {provider}", file=sys.stderr)
+                    provider_data["api_key"] = api_key
 
         # override config values with command line flags or environment variables
-        config_data = merge_dicts(config_data, self.overrides)
+        # (config_data is owned here, either freshly parsed or loaded from the cache)
+        merge_dicts_in_place(config_data, self.overrides)
 
         # After all merging is complete (after line 97), convert providers dict to ProviderManager
         if 'providers' in config_data:
-            provider_manager = ProviderManager(config_data['providers'])
+            providers = config_data['providers']
+            # the merged provider sources are already lowercase; only command line overrides may not be
+            if self.overrides.get('providers'):
+                providers = lowercase_provider_names(providers)
+            if trusted_providers:
+                # the provider data is trusted, so build the configs without validating them;
+                # ProviderManager keeps ProviderConfig objects as they are
+                provider_manager = ProviderManager(
+                    {provider_name: ProviderConfig.model_construct(**provider_data)
+                     for provider_name, provider_data in providers.items()})
+            else:
+                provider_manager = ProviderManager(providers)
             config_data['providers'] = provider_manager
 
-        try:
-            return ConfigModel(**config_data)
-        except ValidationError as e:
-            raise e
+        if has_config_field_types(config_data):
+            # nothing for validation to coerce, so skip it
+            config = ConfigModel.model_construct(**config_data)
+        else:
+            try:
+                config = ConfigModel(**config_data)
+            except ValidationError as e:
+                raise e
+        # only cache files that produced a valid config
+        if cache_update is not None:
+            write_config_cache(*cache_update)
+        return config, config_file_stat is not None
+
+
+    def load_config_files(self, config_file, provider_config_path, create_config, config_file_stat, provider_config_stat):
+        """
+        Parse the TOML config file and the provider YAML file.
+
+        Returns (config_data, yaml_providers, from_cache, cache_update).  Parsed results
+        are cached in a sidecar file keyed by both files' modification time and size, so
+        unchanged files are not re-parsed on the next start.  cache_update holds the
+        (cache_file, cache_key, cache_data) arguments for write_config_cache, or None
+        when there is nothing to cache; the caller writes it once the config has been
+        validated.
+        """
+        config_signature = file_signature(config_file_stat)
+        provider_signature = file_signature(provider_config_stat)
+        cache_key = (config_file, config_signature, provider_config_path, provider_signature)
+        cache_file = os.path.join(self.data_directory, CONFIG_CACHE_FILE_NAME)
+        if config_file_stat is not None:
+            cached_files = read_config_cache(cache_file, cache_key)
+            if cached_files is not None:
+                config_data, yaml_providers = cached_files
+                return config_data, yaml_providers, True, None
+
+        parsed_cleanly = True
+        config_data = {}
+        if config_file_stat is not None:
+            try:
+                import tomllib
+                # read the whole file in one call and parse from the string
+                with open(config_file, 'r') as file:
+                    config_data = tomllib.loads(file.read())
+            except Exception as e:
+                if not create_config:
+                    print(f"Error loading config file: {e}")
+                    raise e
+                config_data = {}
+                parsed_cleanly = False
+        else:
+            if not create_config:
+                print(f"WARNING: no config file found at {config_file}.", file=sys.stderr)
 
+        yaml_providers = None
+        if provider_config_stat is not None:
+            try:
+                import yaml
+                # use the libyaml C loader when PyYAML was built with it
+                yaml_loader = getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+                # read the whole file in one call and parse from the string
+                with open(provider_config_path, 'r') as file:
+                    provider_data = yaml.load(file.read(), Loader=yaml_loader)
+                if provider_data and 'providers' in provider_data:
+                    yaml_providers = provider_data['providers']
+            except Exception as e:
+                print(f"Error loading provider config: {e}")
+                parsed_cleanly = False
+
+        cache_update = None
+        if parsed_cleanly and config_file_stat is not None:
+            # serialized now because the caller modifies config_data while building the config
+            cache_update = (cache_file, cache_key, serialize_config_cache(cache_key, (config_data, yaml_providers)))
+        return config_data, yaml_providers, False, cache_update
 
     def save(self):
         """Save the configuration to the config file."""
-        config_file = os.path.join(self.data_directory, "config.toml")
-        with open(config_file, 'w') as f:
-            f.write("# LLM API Chat Configuration File\n\n")
-            for key, value in self.config.model_dump().items():
-                f.write(f"# {ConfigModel.model_fields[key].description}\n")  # Use .description directly
-                f.write(f"{toml.dumps({key: value})}\n\n")
+        # tomllib can only read TOML, so the toml package is still used for writing
+        import toml
+        # Build the whole file first so it goes out in a single write
+        config_parts = ["# LLM API Chat Configuration File\n\n"]
+        # Read the fields directly rather than through model_dump(), which copies the whole
+        # model; only the provider configs need converting to plain dicts
+        for key, description in CONFIG_FIELD_DESCRIPTIONS.items():
+            value = getattr(self.config, key)
+            config_parts.append(f"# {description}\n")
+            if isinstance(value, (str, bool)):
+                # scalar fields are formatted directly instead of through toml.dumps
+                config_parts.append(f"{key} = {format_toml_scalar(value)}\n\n\n")
+                continue
+            if hasattr(value, 'model_dump'):
+                value = value.model_dump()
+            config_parts.append(f"{toml.dumps({key: value})}\n\n")
+        with open(self.config_file, 'w') as f:
+            f.write("".join(config_parts))
         self.new_config = False
 
     def get(self, key):
@@ -149,33 +365,21 @@ class Config:
 
     def get_provider_api_key(self, provider: str) -> str:
         """Get API key for a specific provider."""
-        provider = provider.lower()
-        provider_config = self.config.providers.get(provider)
-        if provider_config:
-            return provider_config.api_key
-        raise ValueError(f"Provider '{provider}' not found in configuration")
+        return self.get_provider_config(provider).api_key
 
     def get_provider_base_url(self, provider: str) -> str:
         """Get base API URL for a specific provider."""
-        provider = provider.lower()
-        provider_config = self.config.providers.get(provider)
-        if provider_config:
-            return provider_config.base_api_url
-        raise ValueError(f"Provider '{provider}' not found in configuration")
+        return self.get_provider_config(provider).base_api_url
 
     def get_provider_valid_models(self, provider: str) -> dict[str, str]:
         """Get valid models for a specific provider."""
-        provider = provider.lower()
-        provider_config = self.config.providers.get(provider)
-        if provider_config:
-            return provider_config.valid_models
-        raise ValueError(f"Provider '{provider}' not found in configuration")
+        return self.get_provider_config(provider).valid_models
 
     def _prompt_create_config(self):
         """Prompt the user to create a default configuration file."""
         # Only prompt in interactive mode when running the main application
         # Don't prompt when being used programmatically (e.g., in tests)
-        if sys.stdin.isatty() and hasattr(sys, 'argv') and len(sys.argv) > 0 and 'pytest' not in sys.argv[0]:
+        if sys.stdin.isatty() and sys.argv and 'pytest' not in sys.argv[0]:
             print(f"\nNo configuration found in {self.data_directory}")
             print("Would you like to create a default configuration file? (Y/n): ", end="")
 
@@ -185,13 +389,13 @@ class Config:
                     response = 'y'
                 if response in ['y', 'yes']:
                     # Create data directory if it doesn't exist
-                    if not os.path.exists(self.data_directory):
+                    if stat_path(self.data_directory) is None:
                         os.makedirs(self.data_directory)
                         print(f"Created data directory: {self.data_directory}")
 
                     # Create default config file
                     self.save()
-                    print(f"Created default configuration file: {os.path.join(self.data_directory, 'config.toml')}")
+                    print(f"Created default configuration file: {self.config_file}")
                     print("Please edit the configuration file to add your API keys and preferences.")
                     return
                 else:
@@ -1,4 +1,12 @@
+import atexit
+import mmap
+import os
+import queue
 import re
+import shutil
+import sys
+import threading
+from collections import deque
 from prompt_toolkit.history import FileHistory
 from typing import Optional
 
@@ -6,57 +14,117 @@ from typing import Optional
 CustomFileHistory class that limits the number of history entries.
 For use with prompt_toolkit.
 """
+# One history entry: the "# timestamp" line written by FileHistory.store_string and its "+" lines
+HISTORY_ENTRY_PATTERN = re.compile(rb'\n#.*?(?:\n\+.*?)*(?=\n#|\Z)', re.DOTALL)
+
 class CustomFileHistory(FileHistory):
     """
     :class:`.FileHistory` class that limits the number of history entries.
+
+    The history file is truncated on a background thread so the prompt doesn't wait
+    for the rewrite.  Call flush() to wait for a pending truncation; this is also done
+    at exit.
     """
 
     def __init__(self, filename: str, max_history: Optional[int] = None, skip_prefixes: list[str] = []) -> None:
         super().__init__(filename)
         self.max_history = max_history
         self.skip_prefixes = skip_prefixes
+        # str.startswith takes a tuple of prefixes and checks them all in one call
+        self.skip_prefixes_tuple = tuple(skip_prefixes)
         self.usage_count = 0
-        self.high_water_mark = 10
+        # Entries appended between truncations.  Scaling it with max_history lets the file
+        # grow by up to a quarter before it is rewritten, so large histories aren't
+        # rewritten every few entries.
+        self.high_water_mark = max(10, (max_history or 0) // 4)
+        # Serializes appends with truncation, which rewrites the file and reloads the history
+        self.history_lock = threading.Lock()
+        self.truncate_queue = queue.Queue()
+        self.truncate_thread = None
 
     def append_string(self, string: str) -> None:
-        if any(string.startswith(prefix) for prefix in self.skip_prefixes):
+        if string.startswith(self.skip_prefixes_tuple):
             return
-        super().append_string(string)
+        with self.history_lock:
+            super().append_string(string)
         self.usage_count += 1
         if self.usage_count > self.high_water_mark:
             self.usage_count = 0
-            self._truncate_file()
+            self.request_truncate()
 
-    def _truncate_file(self) -> None:
+    def request_truncate(self) -> None:
         """
-        Truncate the file to remove the oldest entries.
+        Queue a truncation of the history file for the background thread, starting the
+        thread on first use.
         """
-        # Open the file and read its contents
-        with open(self.filename, 'r') as file:
-            content = file.read()
-
-        # Define the regex pattern
-        pattern = r'\n#.*?(?:\n\+.*?)*(?=\n#|\Z)'
+        if self.truncate_thread is None:
+            self.truncate_thread = threading.Thread(target=self._truncate_worker, daemon=True)
+            self.truncate_thread.start()
+            # the thread is a daemon, so don't let the process exit in the middle of a rewrite
+            atexit.register(self.flush)
+        self.truncate_queue.put(None)
 
-        # Find all matches in the content
-        matches = re.findall(pattern, content, re.DOTALL)
+    def flush(self) -> None:
+        """Wait for any queued truncation of the history file to finish."""
+        self.truncate_queue.join()
 
-        if self.max_history and len(matches) > self.max_history:
-            matches = matches[-self.max_history:]
+    def _truncate_worker(self) -> None:
+        while True:
+            self.truncate_queue.get()
+            try:
+                self._truncate_file()
+            except Exception as e:
+                print(f"Error truncating history file: {e}", file=sys.stderr)
+            finally:
+                self.truncate_queue.task_done()
 
-            # Store each entry in an array
-            entries = [f"\n{match.strip()}" for match in matches]
+    def _truncate_file(self) -> None:
+        """
+        Truncate the file to remove the oldest entries.
+        """
+        if not self.max_history:
+            return
+        with self.history_lock:
+            with open(self.filename, 'rb') as file:
+                try:
+                    content = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    # an empty file can't be mapped, and has nothing to truncate
+                    return
+                with content:
+                    # Scan the mapped file for entries, keeping only the start offsets of the
+                    # newest max_history entries rather than a list of every entry
+                    entry_starts = deque(maxlen=self.max_history)
+                    entry_count = 0
+                    for match in HISTORY_ENTRY_PATTERN.finditer(content):
+                        entry_starts.append(match.start())
+                        entry_count += 1
+                    if entry_count <= self.max_history:
+                        return
+                    # the kept entries run from the start of the oldest one to the end of the file
+                    truncated_content = content[entry_starts[0]:]
 
-            with open(self.filename, "w") as f:
-                # write the truncated entrieq to the file
-                f.write("\n".join(entries))
-                f.write("\n")
+            # Write the kept entries to a temporary file with a single call, then move it into
+            # place, so a crash mid-write can't leave the history file truncated or empty.
+            # The file a symlink points to is the one replaced, and it keeps its permissions.
+            filename = os.path.realpath(self.filename)
+            temp_filename = f"{filename}.tmp"
+            with open(temp_filename, "wb") as f:
+                f.write(truncated_content)
+            shutil.copymode(filename, temp_filename)
+            os.replace(temp_filename, filename)
 
-            self._loaded_strings = list(self.load_history_strings())
+            # The in-memory history holds the same entries, newest first, so trim it to match
+            # instead of reading back and re-parsing the file just written
+            del self._loaded_strings[self.max_history:]
 
 
     def clear_history(self):
         """Clear the history file."""
-        with open(self.filename, "w") as f:
-            f.write("") # clear the file
-        self._loaded_strings = []
+        with self.history_lock:
+            try:
+                os.truncate(self.filename, 0)  # clear the file
+            except FileNotFoundError:
+                # no history has been written yet, so there is nothing to clear
+                pass
+            self._loaded_strings = []
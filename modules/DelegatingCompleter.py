@@ -21,12 +21,17 @@ class DelegatingCompleter(Completer):
         The second completer to delegate to when decision_function returns False
     decision_function : callable
         A function that takes a Document and returns a boolean indicating
-        which completer should handle the request
+        which completer should handle the request.  It must depend only on the
+        text before the cursor, since its result is reused while that text is
+        unchanged.
     """
     def __init__(self, completer_a, completer_b, decision_function):
         self.completer_a = completer_a
         self.completer_b = completer_b
         self.decision_function = decision_function
+        # text before the cursor and the decision made for it by the last call
+        self.last_text_before_cursor = None
+        self.last_decision = None
 
     def get_completions(self, document, complete_event):
         """
@@ -34,7 +39,8 @@ class DelegatingCompleter(Completer):
 
         This method uses the decision function to determine which completer
         (completer_a or completer_b) should handle the current completion request,
-        then delegates to that completer's get_completions method.
+        then delegates to that completer's get_completions method.  The decision is
+        reused while the text before the cursor is unchanged.
 
         Parameters:
         -----------
@@ -48,7 +54,11 @@ class DelegatingCompleter(Completer):
         Completion
             Completion objects from the delegated completer
         """
-        if self.decision_function(document):
+        text_before_cursor = document.text_before_cursor
+        if text_before_cursor != self.last_text_before_cursor:
+            self.last_decision = self.decision_function(document)
+            self.last_text_before_cursor = text_before_cursor
+        if self.last_decision:
             yield from self.completer_a.get_completions(document, complete_event)
         else:
             yield from self.completer_b.get_completions(document, complete_event)
\ No newline at end of file
@@ -1,6 +1,5 @@
 from prompt_toolkit.key_binding import KeyBindings
 from prompt_toolkit.filters import Condition
-import pyperclip
 
 class KeyBindingsHandler:
     def __init__(self, chat_interface):
@@ -9,34 +8,36 @@ class KeyBindingsHandler:
     def create_key_bindings(self):
         bindings = KeyBindings()
 
+        def current_buffer():
+            return self.chat_interface.session.app.current_buffer
+
         @Condition
         def is_eob():
-            ok = not self.chat_interface.session.app.current_buffer.complete_state
-            ok = ok and self.chat_interface.session.app.current_buffer.document.is_cursor_at_the_end
-            return ok
+            buffer = current_buffer()
+            return not buffer.complete_state and buffer.document.is_cursor_at_the_end
 
         @Condition
         def not_eob():
-            return not self.chat_interface.session.app.current_buffer.document.is_cursor_at_the_end
+            return not current_buffer().document.is_cursor_at_the_end
 
         @Condition
         def is_not_completing():
-            return not self.chat_interface.session.app.current_buffer.complete_state
+            return not current_buffer().complete_state
 
         @Condition
         def is_completing():
-            return self.chat_interface.session.app.current_buffer.complete_state
+            return current_buffer().complete_state
 
         @Condition
         def is_empty_buffer():
-            buffer = self.chat_interface.session.app.current_buffer
+            buffer = current_buffer()
             return buffer.text == '' and buffer.cursor_position == 0
 
         @Condition
         def starts_with_slash():
             """Check if buffer text starts with a slash"""
-            buffer = self.chat_interface.session.app.current_buffer
-            return buffer.text.strip().startswith('/')
+            # only leading whitespace matters here, so skip stripping the end of the buffer
+            return current_buffer().text.lstrip().startswith('/')
 
         # @bindings.add('up', filter=is_not_completing)
         # def custom_up(event):
@@ -123,9 +124,11 @@ class KeyBindingsHandler:
 
         @bindings.add('c-b')
         def _(event):
+            # ChatInterface imports this module, so its pyperclip loader is imported here
+            from modules.ChatInterface import load_pyperclip
             buffer = event.app.current_buffer
             data = buffer.text
-            pyperclip.copy(data)
+            load_pyperclip().copy(data)
 
         @bindings.add('c-l')
         def _(event):
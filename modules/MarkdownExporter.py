@@ -1,4 +1,5 @@
 from datetime import datetime
+from itertools import islice
 class MarkdownExporter:
     def __init__(self, model_name, message_history, title=None, file=None,date=datetime.now(), skip_system=True):
         self.message_history = message_history
@@ -10,24 +11,29 @@ class MarkdownExporter:
 
     def markdown(self, skip_system=True):
         """Export the message history to Markdown."""
-        markdown = ""
+        parts = []
         if self.file:
-            markdown += f"{self.file}.md\n\n"
+            parts.append(f"{self.file}.md\n\n")
         # print the model name and date
         if self.title:
-            title = f"# {self.title}\n({self.model_name})\n\n"
+            parts.append(f"# {self.title}\n({self.model_name})\n\n")
         else:
-            title = f"# {self.model_name} Chat Log\n\n"
-        markdown += title
-        markdown += f"Date: {self.date.strftime("%Y-%m-%d %H:%M:%S")}\n\n"
+            parts.append(f"# {self.model_name} Chat Log\n\n")
+        date = self.date.strftime("%Y-%m-%d %H:%M:%S")
+        parts.append(f"Date: {date}\n\n")
         # print the message history
-        messages = self.message_history.history.copy()
+        parts.append(self.messages_markdown())
+        return ''.join(parts)
+
+    def messages_markdown(self):
+        """Render the message history as Markdown sections, one per message."""
+        parts = []
+        messages = self.message_history.history
         # skip the system prompt if requested
-        if self.skip_system and messages[0]['role'] == 'system':
-            messages = messages[1:]
-        for msg in messages:
+        start = 1 if self.skip_system and messages and messages[0]['role'] == 'system' else 0
+        for msg in islice(messages, start, None):
             role = msg['role']
             # capitalize the role
             role = role[0].upper() + role[1:]
-            markdown += f"## {role}\n\n{msg['content']}\n\n"
-        return markdown
\ No newline at end of file
+            parts.append(f"## {role}\n\n{msg['content']}\n\n")
+        return ''.join(parts)
@@ -1,4 +1,5 @@
 import re
+from functools import lru_cache
 from pygments.formatters import TerminalFormatter
 from modules.CodeHighlighter import CodeHighlighter
 
@@ -18,14 +19,83 @@ LIST_COLOR = '\033[32m'     # Green for list markers
 BLOCKQUOTE_COLOR = '\033[35m'  # Magenta for blockquotes
 RESET_COLOR = '\033[39;49m'  # Reset foreground and background colors
 
+# Inline formatting attributes, tracked as a bitmask while formatting a line
+BOLD = 1
+ITALIC = 2
+STRIKETHROUGH = 4
+
+# Attributes toggled by each inline marker
+MARKER_ATTRIBUTES = {
+    "~~": STRIKETHROUGH,
+    "***": BOLD | ITALIC,
+    "___": BOLD | ITALIC,
+    "**": BOLD,
+    "__": BOLD,
+    "*": ITALIC,
+    "_": ITALIC,
+}
+
+# ANSI codes that enable and disable each toggled set of attributes
+ATTRIBUTE_CODES = {
+    STRIKETHROUGH: (STRIKETHROUGH_ENABLE, STRIKETHROUGH_DISABLE),
+    BOLD | ITALIC: (BOLD_ENABLE + ITALIC_ENABLE, ITALIC_DISABLE + BOLD_DISABLE),
+    BOLD: (BOLD_ENABLE, BOLD_DISABLE),
+    ITALIC: (ITALIC_ENABLE, ITALIC_DISABLE),
+}
+
+def build_marker_transitions():
+    """
+    Map (active attributes, marker) to the attributes active after the marker and
+    the marker text with its ANSI code: enable codes go before an opening marker,
+    disable codes after a closing one.
+    """
+    transitions = {}
+    for active in range((BOLD | ITALIC | STRIKETHROUGH) + 1):
+        for marker, attributes in MARKER_ATTRIBUTES.items():
+            enable, disable = ATTRIBUTE_CODES[attributes]
+            if active & attributes == attributes:
+                transitions[active, marker] = (active & ~attributes, marker + disable)
+            else:
+                transitions[active, marker] = (active | attributes, enable + marker)
+    return transitions
+
+MARKER_TRANSITIONS = build_marker_transitions()
+
+# Backslash escapes, inline markers in order of precedence, and inline code closed on the same line.
+# Escapes are consumed as pairs so an escaped marker never matches, while an escaped backslash
+# leaves the marker after it active.
+INLINE_MARKER_PATTERN = re.compile(r'\\[\\*_~`#]|~~|\*\*\*|___|\*\*|__|\*|_|`[^`]*`')
+
+# Whole-line formatting: headings, unordered and ordered list items, blockquotes
+HEADING_PATTERN = re.compile(r'^(#{1,6})\s+(.+)$')
+UNORDERED_LIST_PATTERN = re.compile(r'^(\s*-\s+.+)$')
+ORDERED_LIST_PATTERN = re.compile(r'^(\s*\d+\.\s+.+)$')
+BLOCKQUOTE_PATTERN = re.compile(r'^(\s*>\s+.+)$')
+
+# Any character or line prefix the formatter acts on; messages without one are left unchanged
+MARKDOWN_SYNTAX_PATTERN = re.compile(r'[`*_~#>-]|^\s*\d+\.\s', re.MULTILINE)
+
+# A ``` line, which opens or closes a code block whatever follows the backticks
+CODE_FENCE_PATTERN = re.compile(r'^([^\S\n]*```.*)$', re.MULTILINE)
+
+# Fenced code block with an optional language name
+CODE_BLOCK_PATTERN = re.compile(r'```[\t ]*(?P<language>\w+)?\n(?P<code>.*?\n)[ ]*```', re.DOTALL)
+
 class MarkdownFormatter:
     """Enhanced markdown formatter that preserves original markdown syntax while adding ANSI formatting."""
 
-    def __init__(self, message, style=TerminalFormatter):
+    def __init__(self, message, style=TerminalFormatter, use_cache=True):
         self.message = message
         self.formatted_message = message
         # Create console with terminal-friendly settings
-        self.code_block_highlighter = CodeHighlighter(style=style)
+        self.code_block_highlighter = _get_code_highlighter(style)
+        # Plain text without any markdown syntax is shown as it is
+        if not MARKDOWN_SYNTAX_PATTERN.search(message):
+            self.code_blocks = self.highlighted_code_blocks = ()
+            return
+        if use_cache:
+            self.code_blocks, self.highlighted_code_blocks, self.formatted_message = _format_markdown(message, style)
+            return
         self.code_blocks = self._extract_code_blocks()
         self.highlighted_code_blocks = self._highlighted_code_blocks()
         self.formatted_message = self._format_message()
@@ -45,156 +115,89 @@ class MarkdownFormatter:
     def _format_markdown_preserving_syntax(self, text):
         """
         Add ANSI formatting to markdown while preserving the original syntax.
-        Uses selective formatting with line-based reset and independent attribute tracking.
+        Code fences are found with one regex split; every other line is classified
+        once (heading, list item, blockquote) and written straight into a single
+        output list together with its inline formatting, which is reset at the end
+        of every line.
         """
+        out = []
+
+        # Parts alternate between text and ``` lines; text after an odd number of
+        # ``` lines is inside a code block.  Without any ``` the text is a single part.
+        parts = CODE_FENCE_PATTERN.split(text) if '```' in text else (text,)
+        for index, part in enumerate(parts):
+            # Format the ``` lines
+            if index % 2:
+                out.append(f'{CODE_COLOR}{part}{RESET}')
+                continue
+            # Consume code block lines as-is
+            if index % 4 == 2:
+                out.append(part)
+                continue
+
+            for line in part.split('\n'):
+                # Process headings (preserve # characters, single space after them)
+                if heading := HEADING_PATTERN.match(line):
+                    out.append(f'{HEADING_COLOR}{heading.group(1)} ')
+                    self._format_inline_markers(line, out, heading.start(2))
+                    out.append(RESET)
+                # Process unordered and ordered lists (preserve - characters and numbers)
+                elif UNORDERED_LIST_PATTERN.match(line) or ORDERED_LIST_PATTERN.match(line):
+                    out.append(LIST_COLOR)
+                    self._format_inline_markers(line, out)
+                    out.append(RESET)
+                # Process blockquotes (preserve > characters)
+                elif BLOCKQUOTE_PATTERN.match(line):
+                    out.append(BLOCKQUOTE_COLOR)
+                    self._format_inline_markers(line, out)
+                    out.append(RESET)
+                else:
+                    self._format_inline_markers(line, out)
+                out.append('\n')
+            out.pop()
+
+        return ''.join(out)
 
+    def _format_inline_markers(self, line, out, pos=0):
+        """
+        Write line[pos:] to out with ANSI codes around strikethrough, bold, italic
+        and inline code markers, keeping the markers themselves.
+        """
+        # Tokenize the markers with one regex and track active attributes in a bitmask
+        active = 0
+        last_end = pos
 
-        # Process the text line by line
-        lines = text.split('\n')
-        result_lines = []
+        for match in INLINE_MARKER_PATTERN.finditer(line, pos):
+            marker = match.group()
+            out.append(line[last_end:match.start()])
+            last_end = match.end()
 
-        in_code_block = False
-        for line in lines:
-            # Consume code block lines as-is, but format the ``` lines
-            if line.strip().startswith('```'):
-                result_lines.append(f'{CODE_COLOR}{line}{RESET}')
-                in_code_block = not in_code_block
+            # Keep escaped characters as they are
+            if marker[0] == "\\":
+                out.append(marker)
                 continue
-            if in_code_block:
-                result_lines.append(line)
+
+            # Process inline code (preserve ` characters)
+            if marker[0] == "`":
+                out.append(f'{CODE_COLOR}{marker}{RESET_COLOR}')
                 continue
 
-            # Phase 1: Word-group formatting (strikethrough, bold, italics)
-            # Process with selective ANSI codes and independent attribute tracking
-            current_formats = set()  # Track active formatting attributes
-            result_line = ""
-            i = 0
-
-            while i < len(line):
-                # Check for strikethrough (highest precedence)
-                if line[i:i+2] == "~~" and (i == 0 or line[i-1] != "\\"):
-                    # Toggle strikethrough
-                    if "strikethrough" in current_formats:
-                        result_line += "~~"
-                        # Exit strikethrough
-                        result_line += STRIKETHROUGH_DISABLE
-                        current_formats.remove("strikethrough")
-                    else:
-                        # Enter strikethrough
-                        result_line += STRIKETHROUGH_ENABLE
-                        current_formats.add("strikethrough")
-                        result_line += "~~"
-                    i += 2
-                    continue
-
-                # Check for bold+italic (*** or ___)
-                if (line[i:i+3] == "***" or line[i:i+3] == "___") and (i == 0 or line[i-1] != "\\"):
-                    # Toggle bold+italic
-                    if "bold" in current_formats and "italic" in current_formats:
-                        result_line += line[i:i+3]
-                        # Exit bold+italic
-                        result_line += ITALIC_DISABLE + BOLD_DISABLE
-                        current_formats.remove("bold")
-                        current_formats.remove("italic")
-                    else:
-                        # Enter bold+italic
-                        result_line += BOLD_ENABLE + ITALIC_ENABLE
-                        current_formats.add("bold")
-                        current_formats.add("italic")
-                        result_line += line[i:i+3]
-                    i += 3
-                    continue
-
-                # Check for bold (** or __)
-                if (line[i:i+2] == "**" or line[i:i+2] == "__") and (i == 0 or line[i-1] != "\\"):
-                    # Toggle bold
-                    if "bold" in current_formats:
-                        result_line += line[i:i+2]
-                        # Exit bold
-                        result_line += BOLD_DISABLE
-                        current_formats.remove("bold")
-                    else:
-                        # Enter bold
-                        result_line += BOLD_ENABLE
-                        current_formats.add("bold")
-                        result_line += line[i:i+2]
-                    i += 2
-                    continue
-
-                # Check for italic (* or _)
-                if (line[i] == "*" or line[i] == "_") and (i == 0 or line[i-1] != "\\"):
-                    # Toggle italic
-                    if "italic" in current_formats:
-                        result_line += line[i]
-                        # Exit italic
-                        result_line += ITALIC_DISABLE
-                        current_formats.remove("italic")
-                    else:
-                        # Enter italic
-                        result_line += ITALIC_ENABLE
-                        current_formats.add("italic")
-                        result_line += line[i]
-                    i += 1
-                    continue
-
-                # Process inline code (preserve ` characters)
-                if line[i] == "`" and (i == 0 or line[i-1] != "\\"):
-                    # Find the matching backtick
-                    j = i + 1
-                    while j < len(line) and line[j] != "`":
-                        j += 1
-                    if j < len(line):
-                        # Found matching backtick
-                        code_content = line[i:j+1]
-                        result_line += f'{CODE_COLOR}{code_content}{RESET_COLOR}'
-                        i = j + 1
-                        continue
-
-                # Regular character - apply current formatting
-                result_line += line[i]
-                i += 1
-
-            # Add full reset at line end if any formatting is still active
-            if current_formats:
-                result_line += RESET
-
-            # Phase 2: Whole-line formatting (headings, lists, blockquotes)
-            formatted_line = result_line
-
-            # Process headings (preserve # characters)
-            formatted_line = re.sub(r'^(#{1,6})\s+(.+)$',
-                                  rf'{HEADING_COLOR}\1 \2{RESET}',
-                                  formatted_line)
-
-            # Process unordered lists (preserve - characters)
-            if not formatted_line.startswith(HEADING_COLOR):
-                formatted_line = re.sub(r'^(\s*-\s+.+)$',
-                                      rf'{LIST_COLOR}\1{RESET}',
-                                      formatted_line)
-
-            # Process ordered lists (preserve numbers)
-            if not formatted_line.startswith(HEADING_COLOR) and not formatted_line.startswith(LIST_COLOR):
-                formatted_line = re.sub(r'^(\s*\d+\.\s+.+)$',
-                                      rf'{LIST_COLOR}\1{RESET}',
-                                      formatted_line)
-
-            # Process blockquotes (preserve > characters)
-            if not (formatted_line.startswith(HEADING_COLOR) or
-                    formatted_line.startswith(LIST_COLOR)):
-                formatted_line = re.sub(r'^(\s*>\s+.+)$',
-                                      rf'{BLOCKQUOTE_COLOR}\1{RESET}',
-                                      formatted_line)
-
-            result_lines.append(formatted_line)
-
-        text = '\n'.join(result_lines)
-
-        return text
+            # Toggle the marker's attributes, closing them only if all are active
+            active, marker_text = MARKER_TRANSITIONS[active, marker]
+            out.append(marker_text)
+
+        out.append(line[last_end:])
+
+        # Add full reset at line end if any formatting is still active
+        if active:
+            out.append(RESET)
 
     def _extract_code_blocks(self):
         """Extract all code blocks from the message."""
-        code_block_pattern = re.compile(r'```[\t ]*(?P<language>\w+)?\n(?P<code>.*?\n)[ ]*```', re.DOTALL)
-        return code_block_pattern.findall(self.message)
+        # Most messages have no fences, which is much cheaper to check than running the pattern
+        if '```' not in self.message:
+            return []
+        return CODE_BLOCK_PATTERN.findall(self.message)
 
     def _highlighted_code_blocks(self):
         """Return a list of highlighted code blocks."""
@@ -202,10 +205,39 @@ class MarkdownFormatter:
 
     def _highlighted_message(self):
         """Return a message replacing original code blocks with highlighted code blocks."""
-        highlighted_message = self.formatted_message
-        for i, (language, code) in enumerate(self.code_blocks):
-            highlighted_message = highlighted_message.replace(code, self.highlighted_code_blocks[i])
-        return highlighted_message
+        # Code blocks appear verbatim and in order in the formatted message, each on the
+        # line after its opening fence, so one forward scan over the fences finds them
+        message = self.formatted_message
+        parts = []
+        last_end = search_pos = 0
+        for (language, code), highlighted_code in zip(self.code_blocks, self.highlighted_code_blocks):
+            start = self._find_fenced_code(message, code, search_pos)
+            if start == -1:
+                continue
+            parts.append(message[last_end:start])
+            parts.append(highlighted_code)
+            last_end = start + len(code)
+            # Continue after the block's closing fence so it isn't taken for an opening one
+            closing_fence = message.find('```', last_end)
+            search_pos = last_end if closing_fence == -1 else closing_fence + 3
+        parts.append(message[last_end:])
+        return ''.join(parts)
+
+    @staticmethod
+    def _find_fenced_code(message, code, pos):
+        """
+        Return the index of code where it starts the line after a ``` at or after pos,
+        or -1.  Matching only right after a fence keeps the same text in prose from
+        being taken for the code block.
+        """
+        while (fence := message.find('```', pos)) != -1:
+            code_start = message.find('\n', fence) + 1
+            if not code_start:
+                break
+            if message.startswith(code, code_start):
+                return code_start
+            pos = code_start
+        return -1
 
     def list_code_blocks(self):
         """List all code blocks with their indices."""
@@ -231,3 +263,18 @@ class MarkdownFormatter:
         except KeyboardInterrupt:
             print("Aborting...")
             return None
+
+@lru_cache(maxsize=8)
+def _get_code_highlighter(style):
+    """Return a highlighter shared by all formatters using the style."""
+    return CodeHighlighter(style=style)
+
+@lru_cache(maxsize=256)
+def _format_markdown(message, style):
+    """
+    Return the code blocks, highlighted code blocks and formatted text of a message.
+    Results are cached by message and style, so showing a message again or listing
+    its code blocks doesn't re-run the formatter and Pygments.
+    """
+    formatter = MarkdownFormatter(message, style, use_cache=False)
+    return tuple(formatter.code_blocks), tuple(formatter.highlighted_code_blocks), formatter.formatted_message
@@ -1,4 +1,5 @@
 import json
+from bisect import bisect_left
 from modules.MessageSaverLoader import MessageSaverLoader
 
 class MessageHistory:
@@ -7,6 +8,7 @@ class MessageHistory:
     def __init__(self, system_prompt=None):
         """Initialize the message history with an optional system prompt."""
         self.user_indexes = []
+        self.assistant_indexes = []
         if not system_prompt:
             raise ValueError("System prompt is required")
         self.history = []
@@ -19,41 +21,48 @@ class MessageHistory:
         return self.history[0]['content']
 
     def update_indexes(self):
-        """Update the list of user and assistant message indexes."""
-        self.update_user_indexes()
-        self.update_assistant_indexes()
-
-    def update_user_indexes(self):
-        """Update the list of user message indexes."""
-        self.user_indexes = []
-        self.user_message_index = 0
+        """Update the list of user and assistant message indexes in one pass over the history."""
+        user_indexes = []
+        assistant_indexes = []
         for i, msg in enumerate(self.history):
-            if msg['role'] == 'user':
-                self.user_message_index += 1
-                self.user_indexes.append(i)
-
-    def update_assistant_indexes(self):
-        """Update the list of assistant message indexes."""
-        self.assistant_indexes = []
-        self.assistant_message_index = -1
-        for i, msg in enumerate(self.history):
-            if msg['role'] == 'assistant':
-                self.assistant_message_index += 1
-                self.assistant_indexes.append(i)
+            role = msg['role']
+            if role == 'user':
+                user_indexes.append(i)
+            elif role == 'assistant':
+                assistant_indexes.append(i)
+        self.user_indexes = user_indexes
+        self.assistant_indexes = assistant_indexes
+        self.reset_seek()
+
+    def reset_seek(self):
+        """Stop seeking: point past the last user message and at the last assistant message."""
+        self.user_message_index = len(self.user_indexes)
+        self.assistant_message_index = len(self.assistant_indexes) - 1
 
     def add_message(self, role, content):
         """Add a message to the history."""
         self.history.append({"role": role, "content": content})
-        self.update_indexes()
+        # Index only the new message, then reset seeking as update_indexes() would
+        index = len(self.history) - 1
+        if role == 'user':
+            self.user_indexes.append(index)
+        elif role == 'assistant':
+            self.assistant_indexes.append(index)
+        self.reset_seek()
 
     def get_history(self):
-        """Return the current message history."""
+        """
+        Return the current message history.
+
+        This is the live list, not a copy, so passing it to the API each turn is free.
+        Callers must not mutate it; build a new list when a modified history is needed.
+        """
         return self.history
 
     def clear_history(self):
         """Clear the message history."""
         # keep the system prompt
-        self.history = [self.history[0]]
+        del self.history[1:]
         self.update_indexes()
 
     def in_seek_user(self):
@@ -118,13 +127,18 @@ class MessageHistory:
     def update_user_message(self, message):
         """Update the user message at the current seek index and truncate the following messages."""
         index = self.user_indexes[self.user_message_index]
-        self.history = self.history[:index]
+        # Truncate in place rather than copying the messages that are kept
+        del self.history[index:]
+        # Drop the indexes of the truncated messages
+        del self.user_indexes[self.user_message_index:]
+        del self.assistant_indexes[bisect_left(self.assistant_indexes, index):]
         self.add_message("user", message)
 
     def remove_last_user_message(self):
         assert self.history[-1]['role'] == 'user'
-        self.history = self.history[:-1]
-        self.update_indexes()
+        self.history.pop()
+        self.user_indexes.pop()
+        self.reset_seek()
 
     def save_history(self, filename):
         """Save the message history to a file."""
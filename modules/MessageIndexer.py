@@ -10,17 +10,25 @@ class MessageIndexer:
         self.update_indexes()
 
     def update_indexes(self):
-        """Update the list of user and assistant message indexes."""
-        self.update_user_indexes()
-        self.update_assistant_indexes()
+        """Update the list of user and assistant message indexes in one pass over the history."""
+        user_indexes = []
+        assistant_indexes = []
+        for i, msg in enumerate(self.history):
+            role = msg['role']
+            if role == 'user':
+                user_indexes.append(i)
+            elif role == 'assistant':
+                assistant_indexes.append(i)
+        self.user_indexes = user_indexes
+        self.assistant_indexes = assistant_indexes
 
-    def update_user_indexes(self):
-        """Update the list of user message indexes."""
-        self.user_indexes = [i for i, msg in enumerate(self.history) if msg['role'] == 'user']
-
-    def update_assistant_indexes(self):
-        """Update the list of assistant message indexes."""
-        self.assistant_indexes = [i for i, msg in enumerate(self.history) if msg['role'] == 'assistant']
+    def add_message_index(self, role):
+        """Index the message just appended to the history without rescanning it."""
+        index = len(self.history) - 1
+        if role == 'user':
+            self.user_indexes.append(index)
+        elif role == 'assistant':
+            self.assistant_indexes.append(index)
 
     def in_seek_user(self):
         """Check if the history is currently seeking a user message."""
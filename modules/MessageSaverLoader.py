@@ -1,4 +1,6 @@
 import json
+import os
+import shutil
 
 class MessageSaverLoader:
     """Handles saving and loading the message history to/from files."""
@@ -6,12 +8,30 @@ class MessageSaverLoader:
     @staticmethod
     def save_history(history, filename):
         """Save the message history to a file."""
+        # Replace the file a symlink points to rather than the symlink itself
+        target_filename = os.path.realpath(filename)
+        temp_filename = f"{target_filename}.tmp"
         try:
-            with open(filename, 'w') as f:
-                json.dump(history, f, indent=4)
+            # Encode the whole history first so it is written with a single call
+            # instead of json.dump's many small chunk writes
+            payload = json.dumps(history, indent=4)
+            # Write to a temporary file and move it into place, so a failed save
+            # or a crash can't leave a previously saved history truncated
+            with open(temp_filename, 'w') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+            # keep the permissions of a previously saved history
+            if os.path.exists(target_filename):
+                shutil.copymode(target_filename, temp_filename)
+            os.replace(temp_filename, target_filename)
             print(f"Chat history saved to `{filename}`.")
             return True
         except Exception as e:
+            try:
+                os.remove(temp_filename)
+            except OSError:
+                pass
             print(f"Error: Failed to save history to `{filename}`: {e}")
             return False
 
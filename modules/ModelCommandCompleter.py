@@ -1,32 +1,41 @@
 import re
 from prompt_toolkit.completion import Completer, Completion
 
+# Short name in a formatted model string: "provider/long_name (short_name)"
+SHORT_NAME_PATTERN = re.compile(r'\((.*?)\)')
+
 
 class ModelCommandCompleter(Completer):
     """
     A completer that provides intelligent model name suggestions for the `/mod` command.
 
-    This completer uses Jaro-Winkler similarity matching to provide relevant model name
+    This completer uses fuzzy subsequence matching to provide relevant model name
     completions as users type after the `/mod` command. It supports multiple completion
     formats including provider-prefixed names, short names, and long names.
 
     Features:
-    - Intelligent substring matching using Jaro-Winkler similarity
+    - Fuzzy subsequence matching ranked by match spread and name length
     - Case-insensitive matching for better user experience
     - short name display in completion metadata
     - Error handling to maintain clean UX when ProviderManager fails
-    - Performance optimizations including early termination for exact matches
+    - Performance optimizations including lowercasing model names once per model list
 
     Parameters:
     -----------
     provider_manager : ProviderManager
         The provider manager instance used to fetch available model names
-    mod_command_pattern : str
+    mod_command_pattern : str or re.Pattern
         Regular expression pattern to match the `/mod` command and extract model substring
     """
     def __init__(self, provider_manager, mod_command_pattern):
         self.provider_manager = provider_manager
-        self.mod_command_pattern = mod_command_pattern
+        # Accept a pattern string or a compiled pattern; compiled once either way
+        self.mod_command_pattern = re.compile(mod_command_pattern)
+        # Model names last returned by the provider manager, their lowercased forms and
+        # character masks, rebuilt only when the manager returns a different list
+        self.model_names = None
+        self.lowered_model_names = None
+        self.model_name_masks = None
 
     def get_completions(self, document, complete_event):
         """
@@ -52,11 +61,15 @@ class ModelCommandCompleter(Completer):
         model_substring = self.get_model_substring(document)
         model_substring_len = len(model_substring)
         # remove all whitespace from model_substring
-        model_substring = re.sub(r'\s', '', model_substring)
+        model_substring = ''.join(model_substring.split())
         if model_substring_len < 1 and not complete_event.completion_requested:
             return
 
         model_names = self.provider_manager.valid_scoped_models()
+        if model_names is not self.model_names:
+            self.lowered_model_names = [lowercase_for_matching(name) for name in model_names]
+            self.model_name_masks = [character_mask(lowered) for lowered in self.lowered_model_names]
+            self.model_names = model_names
 
         filtered_completions = self.filter_completions(model_names, model_substring)
         for completion in filtered_completions:
@@ -68,7 +81,7 @@ class ModelCommandCompleter(Completer):
     def extract_short_name(self, model_string):
         """Extract short name from formatted model string for display_meta."""
         # Model string format: "provider/long_name (short_name)"
-        match = re.search(r'\((.*?)\)', model_string)
+        match = SHORT_NAME_PATTERN.search(model_string)
         if match:
             return match.group(1)
         return model_string.split('/')[1]  # Fallback to long_name if no short name
@@ -77,8 +90,8 @@ class ModelCommandCompleter(Completer):
         """
         Filter and rank model name completions based on similarity matching.
 
-        This method uses Jaro-Winkler substring matching to find the most relevant
-        model name completions and returns the top 8 matches.
+        This method uses fuzzy subsequence matching to find the model names containing
+        the input characters in order, and returns all of them ranked best first.
 
         Parameters:
         -----------
@@ -89,10 +102,14 @@ class ModelCommandCompleter(Completer):
 
         Returns:
         --------
-        list of tuples (str, float)
-            Top 8 ranked completions with their similarity scores
+        list of [str, int]
+            Matching completions with their scores, lowest (best) score first
         """
-        ranked_completions = fuzzy_subsequence_search(model_substring, model_names)
+        if model_names is self.model_names:
+            ranked_completions = fuzzy_subsequence_search(
+                model_substring, model_names, self.lowered_model_names, self.model_name_masks)
+        else:
+            ranked_completions = fuzzy_subsequence_search(model_substring, model_names)
         return ranked_completions
 
     def get_model_substring(self, document):
@@ -113,7 +130,7 @@ class ModelCommandCompleter(Completer):
             The extracted model substring, or empty string if no match found
         """
         text = document.text_before_cursor
-        matches = re.search(self.mod_command_pattern, text)
+        matches = self.mod_command_pattern.search(text)
         if matches:
             return matches.group(1)
         else:
@@ -122,11 +139,16 @@ class ModelCommandCompleter(Completer):
 
 def is_subsequence(query, target):
     """Check if query is a subsequence of target and return the indices of matched chars."""
+    # ASCII text is lowercased as a whole, which keeps every character's position
+    if query.isascii() and target.isascii():
+        return is_lowercase_subsequence(query.lower(), target.lower())
     q_len, t_len = len(query), len(target)
     q_idx, t_idx = 0, 0
+    # lowercase each query character once rather than at every comparison
+    lowered_query = [char.lower() for char in query]
     matched_indices = []
     while q_idx < q_len and t_idx < t_len:
-        if query[q_idx].lower() == target[t_idx].lower():
+        if lowered_query[q_idx] == target[t_idx].lower():
             matched_indices.append(t_idx)
             q_idx += 1
         t_idx += 1
@@ -134,6 +156,39 @@ def is_subsequence(query, target):
         return matched_indices
     return None
 
+def lowercase_for_matching(text):
+    """
+    Return text lowercased for is_lowercase_subsequence, or None if it isn't ASCII.
+    Lowercasing non-ASCII text as a whole can change its length or differ from
+    lowercasing it one character at a time, so such text goes through is_subsequence.
+    """
+    return text.lower() if text.isascii() else None
+
+def character_mask(lowered_text):
+    """
+    Return a bitmask of the characters in text from lowercase_for_matching, one bit per
+    ASCII code, or None for non-ASCII text.  A query can only be a subsequence of text
+    whose mask has all of the query's bits set.
+    """
+    if lowered_text is None:
+        return None
+    mask = 0
+    for char in set(lowered_text):
+        mask |= 1 << ord(char)
+    return mask
+
+def is_lowercase_subsequence(query, target):
+    """is_subsequence for text already lowercased by lowercase_for_matching."""
+    # Let str.find scan for each query character instead of stepping through target in Python
+    matched_indices = []
+    t_idx = -1
+    for char in query:
+        t_idx = target.find(char, t_idx + 1)
+        if t_idx < 0:
+            return None
+        matched_indices.append(t_idx)
+    return matched_indices
+
 def score_match(matched_indices, target_len):
     """Score based on spread and length."""
     if not matched_indices:
@@ -142,10 +197,32 @@ def score_match(matched_indices, target_len):
     # Combine spread and length, you can tweak weights
     return spread + target_len
 
-def fuzzy_subsequence_search(query, candidates):
+def fuzzy_subsequence_search(query, candidates, lowered_candidates=None, candidate_masks=None):
+    """
+    Rank the candidates containing query as a case-insensitive subsequence, best first.
+    lowered_candidates and candidate_masks may hold lowercase_for_matching() and
+    character_mask() of each candidate, so callers searching the same candidates on
+    every keystroke only compute them once.
+    """
+    if lowered_candidates is None:
+        lowered_candidates = [lowercase_for_matching(candidate) for candidate in candidates]
+    if candidate_masks is None:
+        candidate_masks = [None] * len(candidates)
+    lowered_query = lowercase_for_matching(query)
+    query_mask = character_mask(lowered_query)
+    query_len = len(query)
     results = []
-    for candidate in candidates:
-        matched_indices = is_subsequence(query, candidate)
+    for candidate, lowered_candidate, candidate_mask in zip(candidates, lowered_candidates, candidate_masks):
+        # Each query character needs its own candidate character
+        if len(candidate) < query_len:
+            continue
+        if lowered_query is not None and lowered_candidate is not None:
+            # Skip candidates missing any of the query's characters
+            if candidate_mask is not None and query_mask & ~candidate_mask:
+                continue
+            matched_indices = is_lowercase_subsequence(lowered_query, lowered_candidate)
+        else:
+            matched_indices = is_subsequence(query, candidate)
         if matched_indices is not None:
             score = score_match(matched_indices, len(candidate))
             results.append((score, candidate))
@@ -1,8 +1,8 @@
 import requests
 import json
-import copy
 import sys
 import re
+from types import MappingProxyType
 from typing import Dict, Any, Generator, Union
 from modules.Types import ProviderConfig, PROVIDER_DATA
 from modules.ProviderManager import ProviderManager
@@ -158,8 +158,8 @@ class OpenAIChatCompletionApi:
                         reasoning = True
 
 
-    # copy so tests don't overwrite the class variable
-    provider_data = copy.deepcopy(PROVIDER_DATA)
+    # read-only view instead of a deep copy; Config clones it before merging provider overrides
+    provider_data = MappingProxyType(PROVIDER_DATA)
 
     @classmethod
     def create_api_instance(cls, providers: ProviderManager, provider: str, model: str) -> 'OpenAIChatCompletionApi':
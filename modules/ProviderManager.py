@@ -7,7 +7,6 @@ Dict[str, ProviderConfig] usage.
 """
 
 import os
-import yaml
 from typing import List, Dict, Optional, Tuple, Any
 from modules.ProviderConfig import ProviderConfig
 from modules.ModelDiscoveryService import ModelDiscoveryService
@@ -317,9 +316,13 @@ class ProviderManager:
 
         # Write to YAML file
         try:
+            import yaml
+            yaml_data = {"providers": providers_data}
+            # Serialize with the libyaml C dumper when available, then write the document in one call
+            yaml_dumper = getattr(yaml, 'CDumper', yaml.Dumper)
+            yaml_text = yaml.dump(yaml_data, Dumper=yaml_dumper, default_flow_style=False, sort_keys=False)
             with open(yaml_file_path, 'w') as file:
-                yaml_data = {"providers": providers_data}
-                yaml.dump(yaml_data, file, default_flow_style=False, sort_keys=False)
+                file.write(yaml_text)
         except Exception as e:
             print(f"Error persisting provider configurations to YAML: {e}")
             raise
\ No newline at end of file
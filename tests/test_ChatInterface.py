@@ -105,6 +105,13 @@ def test_print_history(capsys, chat_interface):
     assert "User message" in captured.out
     assert "Assistant message" in captured.out
 
+def test_prompt_messages_follow_model_changes(chat_interface):
+    assert "4o-mini >" in chat_interface.idle_prompt_message.value
+    assert "4o-mini *>" in chat_interface.active_prompt_message.value
+    chat_interface.set_model("openai/4o")
+    assert "4o >" in chat_interface.idle_prompt_message.value
+    assert "4o *>" in chat_interface.active_prompt_message.value
+
 @patch('modules.ChatInterface.pyperclip')
 @patch('builtins.input', return_value='1')
 def test_handle_code_block_command(mock_input, mock_pyperclip, chat_interface):
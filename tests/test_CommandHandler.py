@@ -4,7 +4,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pytest
 from unittest.mock import MagicMock, patch
-from modules.CommandHandler import CommandHandler
+from modules.CommandHandler import CommandHandler, CLEAR_SCREEN_SEQUENCE
 from modules.InAppHelp import IN_APP_HELP
 
 class MockChatInterface:
@@ -40,10 +40,16 @@ def test_clear_history_command(command_handler, capsys):
     captured = capsys.readouterr()
     assert "Chat file history cleared." in captured.out
 
+def test_clear_command(command_handler, capsys):
+    command_handler.handle_command('/clear')
+    captured = capsys.readouterr()
+    assert CLEAR_SCREEN_SEQUENCE in captured.out
+
+@patch('modules.CommandHandler.USE_ANSI_CLEAR', False)
 @patch('os.system')
-def test_clear_command(mock_system, command_handler):
+def test_clear_command_legacy_console(mock_system, command_handler):
     command_handler.handle_command('/clear')
-    mock_system.assert_called_once()
+    mock_system.assert_called_once_with('cls')
 
 def test_reset_command(command_handler, capsys):
     command_handler.handle_command('/reset')
@@ -75,6 +81,26 @@ def test_md_command(command_handler):
     command_handler.handle_command('/md')
     command_handler.chat_interface.export_markdown.assert_called_once()
 
+@pytest.mark.parametrize("config_command", ['/con', '/config'])
+def test_config_command(config_command, command_handler):
+    command_handler.handle_command(config_command)
+    command_handler.chat_interface.show_config.assert_called_once()
+
+@pytest.mark.parametrize("model_command", ['/mod', '/model'])
+def test_model_command(model_command, command_handler):
+    command_handler.handle_command(f'{model_command} 4o-mini')
+    command_handler.chat_interface.set_model.assert_called_once_with('4o-mini')
+
+def test_model_command_without_model(command_handler, capsys):
+    command_handler.handle_command('/mod')
+    command_handler.chat_interface.set_model.assert_not_called()
+    captured = capsys.readouterr()
+    assert "Please specify a model name." in captured.out
+
+def test_dm_command(command_handler):
+    command_handler.handle_command('/dm')
+    command_handler.chat_interface.set_default_model.assert_called_once()
+
 def test_unknown_command(command_handler, capsys):
     command_handler.handle_command('/unknown')
     captured = capsys.readouterr()
@@ -6,7 +6,7 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 import toml
 import pytest
 from modules.Config import Config
-from modules.Types import ConfigModel, DEFAULT_SYSTEM_PROMPT, SASSY_SYSTEM_PROMPT, DEFAULT_MODEL
+from modules.Types import ConfigModel, DEFAULT_SYSTEM_PROMPT, SASSY_SYSTEM_PROMPT, DEFAULT_MODEL, PROVIDER_DATA
 from unittest.mock import patch, mock_open, MagicMock
 from pydantic import ValidationError
 from modules.Types import DEFAULT_MODEL
@@ -112,6 +112,8 @@ def test_load_config_with_missing_file_and_os_env_set(cleanup_temp_files):
 
     config = Config(data_directory=data_directory)
     assert config.get_provider_config("openai").api_key == 'test_api_key_xx'
+    # the environment key must not leak into the shared built-in provider data
+    assert PROVIDER_DATA["openai"]["api_key"] == 'not-configured'
     assert config.get("model") == DEFAULT_MODEL
     assert config.get("system_prompt") == DEFAULT_SYSTEM_PROMPT
     assert config.get_provider_config("openai").base_api_url == "https://api.openai.com/v1"
@@ -138,6 +140,10 @@ def test_load_config_with_invalid_data(cleanup_temp_files, capsys):
     # assert that ValidationError is raised
     with pytest.raises(ValidationError):
         Config(data_directory=data_directory)
+    # invalid files are not cached, so they are validated again on the next load
+    assert not os.path.exists(os.path.join(data_directory, "config.cache"))
+    with pytest.raises(ValidationError):
+        Config(data_directory=data_directory)
 
 def test_is_sassy_method(cleanup_temp_files):
     config_data = {
@@ -216,7 +222,7 @@ def test_config_initialization_with_no_directory(tmp_dir, cleanup_temp_files):
 
 def test_config_load(tmp_dir, mock_config_file):
     with patch("builtins.open", mock_open(read_data=mock_config_file)):
-        with patch("os.path.exists", return_value=[True, False]):
+        with patch("modules.Config.stat_path", return_value=MagicMock()):
             config = Config(data_directory=tmp_dir)
             assert config.config.providers.get_provider_config("openai").api_key == "test_api_key"
             assert config.config.providers.get_provider_config("openai").base_api_url == "https://test.openai.com/v1"
@@ -227,7 +233,7 @@ def test_config_load(tmp_dir, mock_config_file):
 
 def test_sassy_config_load(tmp_dir, sassy_config_file):
     with patch("builtins.open", mock_open(read_data=sassy_config_file)):
-        with patch("os.path.exists", return_value=[True, False]):
+        with patch("modules.Config.stat_path", return_value=MagicMock()):
             config = Config(data_directory=tmp_dir)
             assert config.config.providers.get_provider_config("openai").api_key == "test_api_key"
             assert config.config.providers.get_provider_config("openai").base_api_url == "https://test.openai.com/v1"
@@ -377,3 +383,97 @@ def test_config_error_handling_during_model_discovery_init(cleanup_temp_files):
             # Verify config is still usable despite discovery failure
             assert config.get("model") == "test_model"
             assert config.get("system_prompt") == "test_system_prompt"
+
+def test_config_files_cache(cleanup_temp_files):
+    """Test parsed config files are cached and the cache is invalidated when a file changes."""
+    config_data = {
+        "model": "test_model",
+        "system_prompt": "test_system_prompt",
+        "providers": {
+            "openai": {
+                "api_key": "test_api_key",
+            }
+        }
+    }
+    config_file = create_temp_config_file(config_data)
+    data_directory = os.path.dirname(config_file)
+    Config(data_directory=data_directory)
+    assert os.path.exists(os.path.join(data_directory, "config.cache"))
+
+    # unchanged files are loaded from the cache without parsing
+    with patch('tomllib.loads', side_effect=AssertionError("config file was re-parsed")):
+        config = Config(data_directory=data_directory)
+    assert config.get("model") == "test_model"
+    assert config.get_provider_config("openai").api_key == "test_api_key"
+
+    # the sidecar file is used when the in-process copy of the cache is gone
+    with patch.dict('modules.Config._CONFIG_CACHE_DATA', clear=True):
+        with patch('tomllib.loads', side_effect=AssertionError("config file was re-parsed")):
+            config = Config(data_directory=data_directory)
+    assert config.get("model") == "test_model"
+
+    # a changed config file is parsed again
+    config_data["model"] = "changed_test_model"
+    create_temp_config_file(config_data)
+    config = Config(data_directory=data_directory)
+    assert config.get("model") == "changed_test_model"
+
+def test_provider_names_are_normalized_to_lowercase(cleanup_temp_files):
+    config_data = {
+        "providers": {
+            "DeepSeek": {
+                "api_key": "test_deepseek_key",
+            }
+        }
+    }
+    config_file = create_temp_config_file(config_data)
+    data_directory = os.path.dirname(config_file)
+    config = Config(data_directory=data_directory)
+    assert "DeepSeek" not in config.config.providers
+    assert config.get_provider_api_key("DeepSeek") == "test_deepseek_key"
+    # merged into the built-in provider rather than added alongside it
+    assert config.get_provider_base_url("deepseek") == "https://api.deepseek.com/v1"
+
+def test_chain_merge():
+    from modules.Config import chain_merge
+    d1 = {"a": 1, "nested": {"b": 2, "deeper": {"c": 3}}, "list": [1, 2]}
+    d2 = {"a": None, "nested": {"deeper": {"c": 4, "d": 5}}, "list": [3]}
+    d3 = {"nested": {"b": 6}}
+    merged = chain_merge([d1, d2, d3])
+    assert merged == {"a": 1, "nested": {"b": 6, "deeper": {"c": 4, "d": 5}}, "list": [3]}
+    # inputs are left untouched and share no containers with the result
+    assert d1 == {"a": 1, "nested": {"b": 2, "deeper": {"c": 3}}, "list": [1, 2]}
+    assert d2 == {"a": None, "nested": {"deeper": {"c": 4, "d": 5}}, "list": [3]}
+    assert d3 == {"nested": {"b": 6}}
+    assert merged["nested"]["deeper"] is not d2["nested"]["deeper"]
+    assert merged["list"] is not d2["list"]
+
+def test_provider_getters(cleanup_temp_files):
+    config_file = create_temp_config_file({}, filename='not-config.toml')
+    data_directory = os.path.dirname(config_file)
+    config = Config(data_directory=data_directory)
+    assert config.get_provider_config("OpenAI") is config.config.providers.get("openai")
+    assert config.get_provider_api_key("openai") == "not-configured"
+    assert config.get_provider_base_url("openai") == "https://api.openai.com/v1"
+    assert config.get_provider_valid_models("openai") == PROVIDER_DATA["openai"]["valid_models"]
+    with pytest.raises(ValueError, match="Provider 'unknown' not found in configuration"):
+        config.get_provider_api_key("Unknown")
+    # the getters read the provider config, so later changes to it are visible
+    config.config.providers.get("openai").api_key = "updated_key"
+    assert config.get_provider_api_key("openai") == "updated_key"
+
+def test_missing_config_warns_once(tmp_dir, cleanup_temp_files, capsys):
+    Config(data_directory=os.path.join(tmp_dir, "missing_data_directory"))
+    captured = capsys.readouterr()
+    assert captured.err.count("WARNING: No configuration found") == 1
+
+def test_has_config_field_types():
+    from modules.Config import has_config_field_types
+    assert has_config_field_types({"model": "test_model", "sassy": True, "data_directory": "~/.llmc"})
+    assert not has_config_field_types({"model": "test_model", "sassy": "not_a_boolean"})
+
+@pytest.mark.parametrize("value", ["plain", "multi\nline \"quoted\" \\ text\t", "unicode é 😀", "control \x01 \x7f", True, False])
+def test_format_toml_scalar_round_trips(value):
+    import tomllib
+    from modules.Config import format_toml_scalar
+    assert tomllib.loads(f"key = {format_toml_scalar(value)}")["key"] == value
@@ -41,6 +41,23 @@ def test_truncate_file():
         assert len(strings) == 2
         assert strings[0] == "Again"
         assert strings[1] == "World\nWide"
+def test_truncate_file_keeps_mode_and_symlink():
+    """Test truncating a symlinked history file replaces its target and keeps its permissions."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        target = os.path.join(temp_dir, "history")
+        link = os.path.join(temp_dir, "history_link")
+        open(target, "w").close()
+        os.chmod(target, 0o600)
+        os.symlink(target, link)
+        history = CustomFileHistory(link, max_history=2)
+        history.append_string("Hello")
+        history.append_string("World")
+        history.append_string("Again")
+        history._truncate_file()
+        assert os.path.islink(link)
+        assert os.stat(target).st_mode & 0o777 == 0o600
+        strings = list(CustomFileHistory(target).load_history_strings())
+        assert strings == ["Again", "World"]
 def test_clear_history():
     """Test clearing the history file."""
     with tempfile.NamedTemporaryFile() as temp_file:
@@ -52,3 +69,25 @@ def test_clear_history():
         with open(temp_file.name, "r") as f:
             lines = f.readlines()
             assert len(lines) == 0
+def test_background_truncation():
+    """Test the history file is truncated in the background once the high water mark is passed."""
+    with tempfile.NamedTemporaryFile() as temp_file:
+        history = CustomFileHistory(temp_file.name, max_history=2)
+        for i in range(history.high_water_mark + 1):
+            history.append_string(f"Entry {i}")
+        history.flush()
+        strings = list(CustomFileHistory(temp_file.name).load_history_strings())
+        assert strings == [f"Entry {history.high_water_mark}", f"Entry {history.high_water_mark - 1}"]
+        assert len(history._loaded_strings) == 2
+def test_clear_history_without_file():
+    """Test clearing the history before the history file has been created."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        history = CustomFileHistory(os.path.join(temp_dir, "history"))
+        history.clear_history()
+        assert history._loaded_strings == []
+def test_high_water_mark_scales_with_max_history():
+    """Test the file is rewritten less often for larger histories."""
+    with tempfile.NamedTemporaryFile() as temp_file:
+        assert CustomFileHistory(temp_file.name).high_water_mark == 10
+        assert CustomFileHistory(temp_file.name, max_history=20).high_water_mark == 10
+        assert CustomFileHistory(temp_file.name, max_history=400).high_water_mark == 100
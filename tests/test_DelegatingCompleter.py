@@ -529,4 +529,17 @@ def test_yield_from_behavior():
     actual_completions = list(delegating_completer.get_completions(document, event))
 
     # Verify yield from behavior - should return the exact completions from completer_a
-    assert actual_completions == expected_completions
\ No newline at end of file
+    assert actual_completions == expected_completions
+
+
+def test_decision_reused_while_text_before_cursor_is_unchanged(delegating_completer, mock_document, mock_complete_event):
+    """Test that the decision is cached per text before the cursor."""
+    list(delegating_completer.get_completions(mock_document("/mod gpt"), mock_complete_event))
+    list(delegating_completer.get_completions(mock_document("/mod gpt"), mock_complete_event))
+    assert delegating_completer.decision_function.call_count == 1
+
+    # A change to the text before the cursor makes a new decision
+    delegating_completer.decision_function.return_value = False
+    list(delegating_completer.get_completions(mock_document("hello"), mock_complete_event))
+    assert delegating_completer.decision_function.call_count == 2
+    delegating_completer.completer_b.get_completions.assert_called_once()
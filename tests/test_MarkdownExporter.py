@@ -49,4 +49,10 @@ def test_markdown_with_title(message_history):
 def test_markdown_with_file(message_history):
     exporter = MarkdownExporter("Test model", message_history, file="test")
     markdown = exporter.markdown()
-    assert "test.md\n\n" in markdown
\ No newline at end of file
+    assert "test.md\n\n" in markdown
+
+def test_markdown_empty_history(message_history):
+    message_history.history = []
+    exporter = MarkdownExporter("Test model", message_history)
+    assert exporter.messages_markdown() == ""
+    assert "Test model" in exporter.markdown()
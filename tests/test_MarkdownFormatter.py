@@ -669,3 +669,101 @@ def test_list_formatting_preserves_original_text():
     assert "- Sub-sub-item 1.1.1" in stripped_output
     assert "- Sub-item 1.2" in stripped_output
     assert "- Item 2" in stripped_output
+
+
+def test_inline_code_needs_closing_backtick():
+    """Test that an unclosed backtick is literal text and markers after it are still formatted."""
+    message = "Some `code` then an unclosed ` backtick with **bold**"
+    formatter = MarkdownFormatter(message)
+    formatted_output = formatter.formatted_message
+
+    assert f"unclosed ` backtick with {BOLD_ENABLE}**bold**{BOLD_DISABLE}" in formatted_output
+    assert strip_ansi_codes(formatted_output) == message
+
+
+def test_highlighted_message_replaces_each_block_in_place():
+    """Test that a code block contained in a later block does not steal its highlighting."""
+    message = """```python
+x = 1
+```
+
+```python
+y = 2
+x = 1
+```"""
+    formatter = MarkdownFormatter(message)
+    formatted_output = formatter.formatted_message
+
+    first, second = formatter.highlighted_code_blocks
+    assert first in formatted_output
+    assert second in formatted_output
+    assert formatted_output.index(first) < formatted_output.index(second)
+
+
+def test_highlighted_message_skips_code_text_in_prose():
+    """Test that code text also written in earlier prose is highlighted in the code block."""
+    message = """Start the script with:
+import requests
+
+For example:
+```python
+import requests
+```
+import requests"""
+    formatter = MarkdownFormatter(message)
+    formatted_output = formatter.formatted_message
+
+    highlighted, = formatter.highlighted_code_blocks
+    assert formatted_output.startswith("Start the script with:\nimport requests\n")
+    assert formatted_output.count(highlighted) == 1
+    assert f"```{RESET}\nimport requests" in formatted_output
+    assert f"```python{RESET}\n{highlighted}" in formatted_output
+
+
+def test_escaped_backslash_before_marker():
+    """Test that an escaped backslash does not escape the marker after it."""
+    message = "An escaped backslash \\\\**bold** and an escaped \\*asterisk\\*"
+    formatter = MarkdownFormatter(message)
+    formatted_output = formatter.formatted_message
+
+    assert f"\\\\{BOLD_ENABLE}**bold**{BOLD_DISABLE}" in formatted_output
+    assert "\\*asterisk\\*" in formatted_output
+    assert ITALIC_ENABLE not in formatted_output
+
+
+def test_formatting_is_cached_per_message(monkeypatch):
+    """Test that formatting the same message again reuses the highlighted code blocks."""
+    from modules.CodeHighlighter import CodeHighlighter
+    calls = []
+    highlight_code = CodeHighlighter.highlight_code
+    def counting_highlight_code(self, code, language=None):
+        calls.append(code)
+        return highlight_code(self, code, language)
+    monkeypatch.setattr(CodeHighlighter, 'highlight_code', counting_highlight_code)
+
+    message = "Cached message\n\n```python\nprint('cached')\n```"
+    first = MarkdownFormatter(message)
+    second = MarkdownFormatter(message)
+
+    assert len(calls) == 1
+    assert second.formatted_message == first.formatted_message
+    assert second.code_blocks == first.code_blocks
+    assert MarkdownFormatter(message, use_cache=False).formatted_message == first.formatted_message
+
+
+def test_plain_text_is_unchanged():
+    """Test that a message without markdown syntax is returned as it is."""
+    message = "Just a plain answer.\n\n42 is the number, 3.5 is not a list item."
+    formatter = MarkdownFormatter(message)
+
+    assert formatter.formatted_message == message
+    assert len(formatter.code_blocks) == 0
+    assert len(formatter.highlighted_code_blocks) == 0
+
+
+def test_code_highlighter_shared_between_formatters():
+    """Test that formatters with the same style share one code highlighter."""
+    first = MarkdownFormatter("First *message*", use_cache=False)
+    second = MarkdownFormatter("Second *message*", use_cache=False)
+
+    assert first.code_block_highlighter is second.code_block_highlighter
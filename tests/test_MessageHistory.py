@@ -81,3 +81,52 @@ def test_save_and_load_history(tmp_path):
     new_history = MessageHistory(system_prompt="Test System Prompt")
     new_history.load_history(file_path)
     assert new_history.get_history() == history.get_history()
+
+def test_failed_save_keeps_previous_history(tmp_path, monkeypatch):
+    """Test that a save which fails part way leaves the previously saved history intact."""
+    history = MessageHistory(system_prompt="Test System Prompt")
+    history.add_message("user", "Hello")
+    file_path = tmp_path / "test_history.json"
+    assert history.save_history(file_path)
+    saved = file_path.read_text()
+
+    def failing_replace(src, dst):
+        raise OSError("disk full")
+    monkeypatch.setattr("modules.MessageSaverLoader.os.replace", failing_replace)
+    history.add_message("assistant", "Hi there!")
+    assert not history.save_history(file_path)
+    assert file_path.read_text() == saved
+    assert list(tmp_path.iterdir()) == [file_path]
+
+def test_save_keeps_mode_and_symlink(tmp_path):
+    """Test that saving through a symlink replaces its target and keeps the target's permissions."""
+    history = MessageHistory(system_prompt="Test System Prompt")
+    history.add_message("user", "Hello")
+    target_path = tmp_path / "test_history.json"
+    target_path.write_text("[]")
+    target_path.chmod(0o600)
+    link_path = tmp_path / "test_history_link.json"
+    link_path.symlink_to(target_path)
+    assert history.save_history(link_path)
+    assert link_path.is_symlink()
+    assert target_path.stat().st_mode & 0o777 == 0o600
+    new_history = MessageHistory(system_prompt="Other System Prompt")
+    new_history.load_history(target_path)
+    assert new_history.get_history() == history.get_history()
+    assert sorted(tmp_path.iterdir()) == [target_path, link_path]
+
+def test_indexes_after_update_user_message():
+    """Test that message indexes stay in sync when an earlier user message is replaced."""
+    history = MessageHistory(system_prompt="Test System Prompt")
+    history.add_message("user", "First")
+    history.add_message("assistant", "First reply")
+    history.add_message("user", "Second")
+    history.add_message("assistant", "Second reply")
+    history.seek_previous_user_message()
+    history.seek_previous_user_message()
+    history.update_user_message("Replaced")
+    assert history.user_indexes == [1]
+    assert history.assistant_indexes == []
+    history.add_message("assistant", "New reply")
+    assert history.assistant_indexes == [2]
+    assert history.get_last_assistant_message()['content'] == "New reply"
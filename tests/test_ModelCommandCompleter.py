@@ -795,4 +795,30 @@ def test_whitespace_removal_in_model_substring(model_completer, mock_document, m
             list(model_completer.get_completions(document, mock_complete_event))
             assert captured_substring == expected_cleaned
         finally:
-            model_completer.filter_completions = original_filter
\ No newline at end of file
+            model_completer.filter_completions = original_filter
+
+def test_lowered_model_names_cached_until_model_list_changes(model_completer, mock_document, mock_complete_event):
+    """Test that model names are lowercased once per model list, not on every keystroke."""
+    list(model_completer.get_completions(mock_document("/mod gpt"), mock_complete_event))
+    lowered_model_names = model_completer.lowered_model_names
+    assert "openai/gpt-4o (gpt4o)" in lowered_model_names
+
+    list(model_completer.get_completions(mock_document("/mod gpt4"), mock_complete_event))
+    assert model_completer.lowered_model_names is lowered_model_names
+
+    model_completer.provider_manager.valid_scoped_models.return_value = ["Groq/Llama-3 (Llama3)"]
+    completions = list(model_completer.get_completions(mock_document("/mod llama"), mock_complete_event))
+    assert model_completer.lowered_model_names == ["groq/llama-3 (llama3)"]
+    assert [completion.text for completion in completions] == ["Groq/Llama-3"]
+
+
+def test_fuzzy_subsequence_search_with_character_masks():
+    """Test that precomputed character masks reject candidates without changing the ranking."""
+    from modules.ModelCommandCompleter import lowercase_for_matching, character_mask
+    candidates = ["openai/GPT-4o (gpt4o)", "groq/llama-3 (llama3)", "provider/mödël (model)"]
+    lowered = [lowercase_for_matching(candidate) for candidate in candidates]
+    masks = [character_mask(candidate) for candidate in lowered]
+    assert masks[2] is None
+
+    for query in ["gpt", "GPT4", "llama", "möd", "zz", ""]:
+        assert fuzzy_subsequence_search(query, candidates, lowered, masks) == fuzzy_subsequence_search(query, candidates)